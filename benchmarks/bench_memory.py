@@ -0,0 +1,54 @@
+import gc
+import time
+import argparse
+import tracemalloc
+
+from lib.core.data.item import PasswordItem, CardItem, IdentityItem
+
+
+DATA = {
+    PasswordItem: lambda i: {
+        "title": f"Entry {i}",
+        "url": f"https://site{i}.example.com/login",
+        "login": f"user{i}",
+        "password": f"password-{i}",
+    },
+    CardItem: lambda i: {
+        "title": f"Card {i}",
+        "number": "4111 1111 1111 1111",
+        "cvv": "123",
+    },
+    IdentityItem: lambda i: {
+        "title": f"Identity {i}",
+        "full_name": f"Name {i}",
+    },
+}
+
+
+def measure(cls: type, nitems: int) -> tuple:
+    # field values are built first, so only the item objects themselves are counted
+    data = [DATA[cls](i) for i in range(nitems)]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = [cls(d) for d in data]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size / nitems, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure memory held by item objects")
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{args.items} items per type")
+    for cls in DATA:
+        per_item, elapsed = measure(cls, args.items)
+        print(f"{cls.__name__:>13} {per_item:8.1f} bytes/item  construct {elapsed:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import time
+import typing
+import argparse
+import tempfile
+
+from lib.core.database import Pool
+from lib.core.sqlite_database import SQLiteDatabase
+from lib.core.data.item import PasswordItem
+from lib.core.data.group import PasswordsGroup
+from lib.crypto import hasher, cipher, encoder, generate
+
+
+MASTER_KEY = "master-key"
+PAGE_SIZE = 256
+
+
+def create_vault(location: str, nitems: int, ngroups: int) -> None:
+    db = SQLiteDatabase.create(location, "Benchmark", MASTER_KEY, hasher.SHA256, cipher.AES_CBC, encoder.Base64)
+    for g in range(ngroups):
+        items = [PasswordItem({
+            "title": f"Entry {i}",
+            "url": f"https://site{i}.example.com/login",
+            "login": f"user{i}",
+            "password": generate.password(20),
+            "notes": "notes " * 10,
+        }) for i in range(g, nitems, ngroups)]
+        db.add_group(PasswordsGroup(name=f"Group {g}", items=items))
+
+    db.save()
+    db.close()
+
+
+def time_open(location: str, workers: int, pool: Pool) -> typing.Tuple[float, float, float]:
+    db = SQLiteDatabase(location)
+    start = time.perf_counter()
+    db.open(MASTER_KEY, workers=workers, pool=pool)
+    unlock = time.perf_counter() - start
+    db.groups()[0].items(0, PAGE_SIZE)
+    page = time.perf_counter() - start
+    for group in db.groups():
+        group.prefetch()
+
+    elapsed = time.perf_counter() - start
+    db.close()
+    return unlock, page, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure SQLiteDatabase.open with parallel decryption")
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    location = os.path.join(tempfile.gettempdir(), generate.string(10))
+    create_vault(location, args.items, args.groups)
+    try:
+        workers = sorted({1, 2, 4, os.cpu_count() or 1})
+        base = None
+        print(f"{args.items} items, {args.groups} groups, {os.cpu_count()} cpus")
+        for pool in Pool:
+            for w in workers:
+                unlock, page, best = min(time_open(location, w, pool) for _ in range(args.repeat))
+                base = base or best
+                print(f"{pool.value:>8} workers={w:<3} unlock {unlock * 1000:7.2f}ms"
+                      f"  first page {page * 1000:7.2f}ms  all groups {best:8.3f}s  x{base / best:.2f}")
+    finally:
+        os.remove(location)
+
+
+if __name__ == "__main__":
+    main()
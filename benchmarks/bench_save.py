@@ -0,0 +1,65 @@
+import os
+import time
+import argparse
+import tempfile
+
+from lib.core.sqlite_database import SQLiteDatabase
+from lib.core.data.item import PasswordItem
+from lib.core.data.group import PasswordsGroup
+from lib.crypto import hasher, cipher, encoder, generate
+
+
+MASTER_KEY = "master-key"
+
+
+def make_items(nitems: int) -> list:
+    return [PasswordItem({
+        "title": f"Entry {i}",
+        "url": f"https://site{i}.example.com/login",
+        "login": f"user{i}",
+        "password": generate.password(20),
+        "notes": "notes " * 10,
+    }) for i in range(nitems)]
+
+
+def bench(nitems: int, chunk_size: int) -> None:
+    location = os.path.join(tempfile.gettempdir(), generate.string(10))
+    db = SQLiteDatabase.create(location, "Benchmark", MASTER_KEY, hasher.SHA256, cipher.AES_CBC, encoder.Base64)
+    try:
+        items = make_items(nitems)
+        db.add_group(PasswordsGroup(name="Passwords", items=items))
+        start = time.perf_counter()
+        db.save(chunk_size)
+        insert = time.perf_counter() - start
+
+        for item in items:
+            item.entry("notes", "changed")
+
+        start = time.perf_counter()
+        db.save(chunk_size)
+        update = time.perf_counter() - start
+
+        items[len(items) // 2].entry("notes", "changed again")
+        start = time.perf_counter()
+        db.save(chunk_size)
+        single = time.perf_counter() - start
+
+        print(f"{nitems:>7} items  insert {insert:7.3f}s ({nitems / insert:9.0f}/s)"
+              f"  update {update:7.3f}s ({nitems / update:9.0f}/s)  one edit {single * 1000:7.2f}ms")
+    finally:
+        db.close()
+        os.remove(location)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure SQLiteDatabase.save throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--chunk-size", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        bench(n, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import hmac
+import typing
+import hashlib
+
+from .search import TOKEN_RE, host
+
+
+TOKEN_LENGTH = 16
+ITERATIONS = 4096
+
+# separates the index key from the cipher key derived from the same master key and salt
+KEY_CONTEXT = b"item_index:"
+CHECK_TERM = "check:"
+
+
+def derive(master_key: bytes, salt: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", master_key, KEY_CONTEXT + salt, ITERATIONS)
+
+
+def terms(data: typing.Dict[str, str]) -> typing.Set[str]:
+    ''' normalized title words, url host and login, prefixed by their field so a title word never matches a login '''
+    result = set()
+    if data.get("title"):
+        result.update("title:" + word for word in TOKEN_RE.findall(data["title"].casefold()))
+    if data.get("url") and host(data["url"]):
+        result.add("host:" + host(data["url"]))
+    if data.get("login") and data["login"].strip():
+        result.add("login:" + data["login"].strip().casefold())
+
+    return result
+
+
+def token(key: bytes, term: str) -> bytes:
+    return hmac.new(key, term.encode(), hashlib.sha256).digest()[:TOKEN_LENGTH]
+
+
+def tokens(key: bytes, data: typing.Dict[str, str]) -> typing.List[bytes]:
+    return [token(key, term) for term in terms(data)]
+
+
+def check(key: bytes) -> bytes:
+    ''' stored next to the tokens, a mismatch means they were written with another key or never built '''
+    return token(key, CHECK_TERM)
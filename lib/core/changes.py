@@ -0,0 +1,100 @@
+import typing
+
+from .data.item import NO_ID
+
+
+class ChangeSet:
+    ''' pending changes of an opened database, written by the next save '''
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.meta = False
+        self.reencrypt = False
+        # groups and items are keyed by identity: {id(obj): obj}
+        self.new_groups = {}
+        self.renamed_groups = {}
+        self.removed_groups = []
+        self.new_items = {}
+        self.modified_items = {}
+        self.removed_items = set()
+
+    def empty(self) -> bool:
+        return not (self.meta or self.reencrypt or self.new_groups or self.renamed_groups or self.removed_groups
+                    or self.new_items or self.modified_items or self.removed_items)
+
+    def modify_meta(self, reencrypt: bool = False) -> None:
+        self.meta = True
+        self.reencrypt = self.reencrypt or reencrypt
+
+    def add_group(self, group: "GroupInterface") -> None:
+        self.new_groups[id(group)] = group
+
+    def rename_group(self, group: "GroupInterface") -> None:
+        if id(group) in self.new_groups:
+            return
+
+        self.renamed_groups[id(group)] = group
+
+    def remove_group(self, group: "GroupInterface") -> None:
+        # items of a group that was never loaded cannot have pending changes
+        for item in group._items:
+            self.new_items.pop(id(item), None)
+            self.modified_items.pop(id(item), None)
+
+        self.renamed_groups.pop(id(group), None)
+        if self.new_groups.pop(id(group), None) is not None:
+            return
+
+        self.removed_groups.append(group._id)
+
+    def is_new_group(self, group: "GroupInterface") -> bool:
+        return id(group) in self.new_groups
+
+    def add_item(self, item: "ItemInterface") -> None:
+        if self.is_new_group(item.group()):
+            return
+
+        if item._id == NO_ID:
+            self.new_items[id(item)] = item
+        else:
+            self.modified_items[id(item)] = item
+
+    def modify_item(self, item: "ItemInterface") -> None:
+        if item._id == NO_ID or self.is_new_group(item.group()):
+            return
+
+        self.modified_items[id(item)] = item
+
+    def remove_item(self, item: "ItemInterface") -> None:
+        self.new_items.pop(id(item), None)
+        self.modified_items.pop(id(item), None)
+        if item._id != NO_ID:
+            self.removed_items.add(item._id)
+
+    def saved(self, groups: typing.Iterable["GroupInterface"], items: typing.Iterable["ItemInterface"]) -> None:
+        ''' drops what a committed part of a chunked save wrote, rows written before the first chunk included '''
+        self.meta = False
+        self.renamed_groups = {}
+        self.removed_groups = []
+        self.removed_items = set()
+        for group in groups:
+            self.new_groups.pop(id(group), None)
+            # items of a saved group that are not written yet are inserted on their own
+            self.new_items.update((id(item), item) for item in group._items if item._id == NO_ID)
+
+        for item in items:
+            self.new_items.pop(id(item), None)
+            self.modified_items.pop(id(item), None)
+
+    def items_to_insert(self) -> typing.List["ItemInterface"]:
+        items = [item for group in self.new_groups.values() for item in group.items()]
+        return items + list(self.new_items.values())
+
+    def items_to_update(self, groups: typing.Iterable["GroupInterface"]) -> typing.List["ItemInterface"]:
+        if not self.reencrypt:
+            return list(self.modified_items.values())
+
+        return [item for group in groups if not self.is_new_group(group)
+                for item in group.items() if id(item) not in self.new_items]
@@ -1,17 +1,35 @@
 
 import os
 import typing
+import threading
 import appdirs
 import yaml
+from enum import Enum
 
+from .database import Status
 from .sqlite_database import SQLiteDatabase
+from .meta_cache import MetaCache, dump, stat
+from . import profile as libprofile
 
 
 CONFIG_FILE = "config.yaml"
+CACHE_FILE = "cache.yaml"
+
+
+class Change(Enum):
+    ADDED = "Added"
+    REMOVED = "Removed"
+    UPDATED = "Updated"
+    RELOADED = "Reloaded"
+
+
+Listener = typing.Callable[[Change, SQLiteDatabase | None], None]
 
 
 class Config:
+    ''' registered databases, initialized once per process '''
     _instance = None
+    _initialized = False
 
     def __new__(cls):
         if cls._instance is None:
@@ -20,26 +38,73 @@ class Config:
         return cls._instance
 
     def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
         self._config_dir = appdirs.user_config_dir("Kee", "")
         self._config_path = os.path.join(self._config_dir, CONFIG_FILE)
+        self._cache = MetaCache(os.path.join(self._config_dir, CACHE_FILE))
+        self._cache_lock = threading.Lock()
+        self._listeners = []
         self._databases = []
         self._read()
+        threading.Thread(target=self._refresh, daemon=True).start()
 
     def databases(self) -> typing.List[SQLiteDatabase]:
         return self._databases
 
+    def listen(self, listener: Listener) -> None:
+        ''' listeners are called from the refresh thread for `Change.UPDATED` '''
+        self._listeners.append(listener)
+
+    def unlisten(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    def reload(self) -> None:
+        ''' rereads the config file, databases that stay registered keep their objects '''
+        current = {db.location(): db for db in self._databases}
+        self._databases = []
+        self._read(current)
+        self._notify(Change.RELOADED, None)
+        threading.Thread(target=self._refresh, daemon=True).start()
+
     def add_database(self, database: SQLiteDatabase) -> None:
         if database in self._databases:
             return
 
         self._databases.append(database)
+        with self._cache_lock:
+            self._cache.put(database.location(), database._meta)
+            self._cache.save()
+
         self._save()
+        self._notify(Change.ADDED, database)
 
     def remove_database(self, database: SQLiteDatabase) -> None:
         self._databases.remove(database)
+        with self._cache_lock:
+            self._cache.remove(database.location())
+            self._cache.save()
+
+        self._save()
+        self._notify(Change.REMOVED, database)
+
+    def profile(self, database: SQLiteDatabase, new_profile: libprofile.Profile = None) -> libprofile.Profile | None:
+        if new_profile is None:
+            return database.profile()
+        elif new_profile == database.profile():
+            return
+
+        database.profile(new_profile)
         self._save()
 
-    def _read(self) -> None:
+    def _notify(self, change: Change, database: SQLiteDatabase | None) -> None:
+        for listener in list(self._listeners):
+            listener(change, database)
+
+    def _read(self, current: typing.Dict[str, SQLiteDatabase] = None) -> None:
+        current = current or {}
         if not os.path.exists(self._config_dir):
             os.makedirs(self._config_dir)
 
@@ -51,15 +116,48 @@ class Config:
             if config is None or "databases" not in config:
                 return
 
+            self._cache.load()
+            profiles = config.get("profiles") or {}
             for loc in config["databases"]:
+                if loc in current:
+                    self._databases.append(current[loc])
+                    continue
+
+                # cached metadata outlives the file, a deleted database is skipped as when it was read
+                if stat(loc) is None:
+                    continue
+
                 try:
-                    self._databases.append(SQLiteDatabase(loc))
+                    profile = libprofile.from_value(profiles.get(loc))
+                    self._databases.append(SQLiteDatabase(loc, profile, self._cache.get(loc)))
                 except:
                     continue
 
+    def _refresh(self) -> None:
+        ''' rereads metadata of closed databases whose files changed since they were cached '''
+        changed = False
+        for db in list(self._databases):
+            if db.status() != Status.CLOSED or not self._cache.stale(db.location()):
+                continue
+
+            try:
+                db._load_meta()
+            except:
+                continue
+
+            with self._cache_lock:
+                self._cache.put(db.location(), db._meta)
+                changed = True
+
+            self._notify(Change.UPDATED, db)
+
+        if changed:
+            with self._cache_lock:
+                self._cache.save()
+
     def _save(self) -> None:
-        with open(self._config_path, "w") as yaml_file:
-            data = {
-                "databases": [db.location() for db in self._databases]
-            }
-            yaml.safe_dump(data, yaml_file)
+        data = {
+            "databases": [db.location() for db in self._databases],
+            "profiles": {db.location(): db.profile().value for db in self._databases},
+        }
+        dump(data, self._config_path)
@@ -0,0 +1,84 @@
+import time
+import sqlite3
+import typing
+import threading
+import contextlib
+import urllib.parse
+from collections import OrderedDict
+
+from . import profile as libprofile
+
+
+CONNECTION_LIMIT = 16
+IDLE_TIMEOUT = 120.0
+
+
+def connect(location: str, profile: libprofile.Profile) -> sqlite3.Connection:
+    connection = libprofile.connect(location, profile)
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
+
+@contextlib.contextmanager
+def read_only(location: str) -> typing.Iterator[sqlite3.Connection]:
+    uri = f"file:{urllib.parse.quote(location)}?mode=ro"
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+class ConnectionPool:
+    ''' keeps at most `limit` connections open, least recently used are closed first '''
+
+    def __init__(self, limit: int = CONNECTION_LIMIT, idle_timeout: float = IDLE_TIMEOUT):
+        self._limit = limit
+        self._idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._connections = OrderedDict()
+
+    def acquire(self, location: str, profile: libprofile.Profile) -> sqlite3.Connection:
+        with self._lock:
+            if location in self._connections:
+                connection, _ = self._connections.pop(location)
+            else:
+                connection = connect(location, profile)
+
+            self._connections[location] = (connection, time.monotonic())
+            self._evict()
+            return connection
+
+    def get(self, location: str) -> sqlite3.Connection | None:
+        with self._lock:
+            connection, _ = self._connections.get(location, (None, None))
+            return connection
+
+    def release(self, location: str) -> None:
+        with self._lock:
+            connection, _ = self._connections.pop(location, (None, None))
+            if connection is not None:
+                connection.close()
+
+    def release_idle(self) -> None:
+        with self._lock:
+            deadline = time.monotonic() - self._idle_timeout
+            for location, (connection, last_used) in list(self._connections.items()):
+                if last_used < deadline and not connection.in_transaction:
+                    self.release(location)
+
+    def size(self) -> int:
+        return len(self._connections)
+
+    def _evict(self) -> None:
+        self.release_idle()
+        # the most recent connection is the one being acquired and is never closed here
+        for location, (connection, _) in list(self._connections.items())[:-1]:
+            if len(self._connections) <= self._limit:
+                break
+
+            if not connection.in_transaction:
+                self.release(location)
+
+
+POOL = ConnectionPool()
@@ -2,10 +2,8 @@
 import typing
 from enum import Enum
 
-from ..database import DatabaseInterface
-from .item import ItemInterface, PasswordItem, CardItem, IdentityItem
-
-from PyQt5.QtCore import QMetaType
+from ..database import DatabaseInterface, Event
+from .item import NO_ID, IDError, ItemInterface, PasswordItem, CardItem, IdentityItem
 
 
 class Type(Enum):
@@ -14,7 +12,7 @@ class Type(Enum):
     CARD = "Card"
 
 
-class GroupInterface(QMetaType):
+class GroupInterface:
 
     def database(self) -> DatabaseInterface:
         raise NotImplementedError("GroupInterface.database is not implemented")
@@ -31,7 +29,7 @@ class GroupInterface(QMetaType):
     def item(self, pos: int) -> ItemInterface:
         raise NotImplementedError("GroupInterface.item is not implemented")
 
-    def items(self) -> typing.List[ItemInterface]:
+    def items(self, offset: int = 0, limit: int = None) -> typing.List[ItemInterface]:
         raise NotImplementedError("GroupInterface.items is not implemented")
 
     def add_item(self, item: ItemInterface) -> None:
@@ -40,23 +38,41 @@ class GroupInterface(QMetaType):
     def remove_item(self, item: ItemInterface) -> None:
         raise NotImplementedError("GroupInterface.delete_item is not implemented")
 
+    def remove_items(self, items: typing.Iterable[ItemInterface]) -> None:
+        raise NotImplementedError("GroupInterface.remove_items is not implemented")
+
+    def index_of(self, item: ItemInterface) -> int:
+        raise NotImplementedError("GroupInterface.index_of is not implemented")
+
+    def prefetch(self) -> None:
+        raise NotImplementedError("GroupInterface.prefetch is not implemented")
+
     def _set_database(self, database: DatabaseInterface) -> None:
         raise NotImplementedError("GroupInterface._set_database is not implemented")
 
+    def _set_id(self, id_: int) -> None:
+        raise NotImplementedError("GroupInterface._set_id is not implemented")
+
 
 class DatabaseError(Exception):
     ...
 
 
 class _BaseGroup(GroupInterface):
+    ''' items keep insertion order, `_positions` maps id(item) to its row for rows below `_indexed` '''
 
     def __init__(self, name: str, type_: Type, item_type: ItemInterface, items: typing.List[ItemInterface]):
         super().__init__()
         self._database = None 
+        self._id = NO_ID
         self._name = name
         self._type = type_
         self._item_type = item_type
         self._items = []
+        self._positions = {}
+        self._indexed = 0
+        self._loader = None
+        self._size = 0
         for item in items:
             self.add_item(item)
 
@@ -70,49 +86,103 @@ class _BaseGroup(GroupInterface):
             return
 
         if self._database is not None:
-            self._database._cursor.execute("""
-                UPDATE `group`
-                SET name = ?
-                WHERE name = ?
-            """, [new_name, self._name])
-            self._database._groups[new_name] = self._database._groups.pop(self._name)
+            self._database._groups.rename(self, new_name)
+            self._database._changes.rename_group(self)
 
         self._name = new_name
         self._modify()
+        if self._database is not None:
+            self._database._notify(Event.GROUP_RENAMED, self)
 
     def type(self) -> Type:
         return self._type
 
     def item(self, pos: int) -> ItemInterface:
+        if pos < 0:
+            self._load()
+        else:
+            self._load(pos + 1)
+
         return self._items[pos]
 
-    def items(self) -> typing.List[ItemInterface]:
-        return self._items
+    def items(self, offset: int = 0, limit: int = None) -> typing.List[ItemInterface]:
+        if limit is None:
+            self._load()
+            return self._items if offset == 0 else self._items[offset:]
+
+        self._load(offset + limit)
+        return self._items[offset:offset + limit]
 
     def add_item(self, item: ItemInterface) -> None:
         self._check_item_type(item)
+        self._load()
         if item.group() is None:
             item._set_group(self)
 
-        self._items.append(item)
+        self._append(item)
+        if self.database():
+            self.database()._changes.add_item(item)
+            self.database()._search.update(item)
+
         self._modify()
 
     def remove_item(self, item: ItemInterface) -> None:
         self._check_item_type(item)
-        self.items().remove(item)
+        self._load()
+        pos = self.index_of(item)
+        del self._items[pos]
+        del self._positions[id(item)]
+        self._indexed = pos
+        if self.database():
+            self.database()._changes.remove_item(item)
+            self.database()._search.remove(item)
+
         self._modify()
 
+    def remove_items(self, items: typing.Iterable[ItemInterface]) -> None:
+        items = list(items)
+        for item in items:
+            self._check_item_type(item)
+
+        self._load()
+        self._reindex()
+        removed = {id(item) for item in items}
+        if not removed <= self._positions.keys():
+            raise ValueError("item is not in group")
+        elif not removed:
+            return
+
+        first = min(self._positions.pop(k) for k in removed)
+        # in place, so lists returned by items() stay valid
+        self._items[first:] = [item for item in self._items[first:] if id(item) not in removed]
+        self._indexed = first
+        if self.database():
+            for item in items:
+                self.database()._changes.remove_item(item)
+                self.database()._search.remove(item)
+
+        self._modify()
+
+    def index_of(self, item: ItemInterface) -> int:
+        # items that are not loaded yet cannot be referenced, so only the loaded rows are searched
+        pos = self._positions.get(id(item))
+        if pos is None or pos >= self._indexed:
+            self._reindex()
+            pos = self._positions.get(id(item))
+
+        if pos is None:
+            raise ValueError("item is not in group")
+
+        return pos
+
     def remove(self) -> None:
         if not self.database():
             raise DatabaseError("database is not setted")
 
-        cur = self.database()._cursor
-        cur.execute("""
-            DELETE FROM `group`
-            WHERE name = ?
-        """, [self.name()])
-        del self.database()._groups[self.name()]
-        self._modify()
+        self.database().remove_group(self)
+
+    def prefetch(self) -> None:
+        self._load()
 
     def _set_database(self, database: DatabaseInterface) -> None:
         if self.database() is not None:
@@ -120,6 +190,45 @@ class _BaseGroup(GroupInterface):
 
         self._database = database
 
+    def _set_id(self, id_: int) -> None:
+        if self._id != NO_ID:
+            raise IDError("group ID already setted")
+
+        self._id = id_
+
+    def _set_loader(self, loader: typing.Callable[["GroupInterface", int, int | None], typing.List[ItemInterface]],
+            size: int) -> None:
+        self._loader = loader
+        self._size = size
+
+    def _load(self, end: int = None) -> None:
+        ''' loads items up to position `end`, or all of them '''
+        if self._loader is None or (end is not None and end <= len(self._items)):
+            return
+
+        offset = len(self._items)
+        limit = None if end is None else end - offset
+        items = self._loader(self, offset, limit)
+        for item in items:
+            item._group = self
+            self._append(item)
+
+        if limit is None or len(items) < limit or len(self._items) >= self._size:
+            self._loader = None
+
+    def _append(self, item: ItemInterface) -> None:
+        self._positions[id(item)] = len(self._items)
+        if self._indexed == len(self._items):
+            self._indexed += 1
+
+        self._items.append(item)
+
+    def _reindex(self) -> None:
+        for pos in range(self._indexed, len(self._items)):
+            self._positions[id(self._items[pos])] = pos
+
+        self._indexed = len(self._items)
+
     def _check_item_type(self, item: ItemInterface) -> None:
         if not isinstance(item, self._item_type):
             raise TypeError(f"invalid item type: {type(item)}")
@@ -131,7 +240,7 @@ class _BaseGroup(GroupInterface):
         self.database()._set_state(self.database()._modified_state)
 
     def __len__(self) -> int:
-        return len(self._items)
+        return self._size if self._loader is not None else len(self._items)
 
 
 class PasswordsGroup(_BaseGroup):
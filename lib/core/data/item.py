@@ -1,17 +1,21 @@
 
 import typing
 import re
+import functools
 import phonenumbers
 import validators
-from collections import defaultdict
-
-from PyQt5.QtCore import QMetaType
 
 
 NO_ID = -1
+VALIDATOR_CACHE_SIZE = 1024
+
+CARD_NUMBER_RE = re.compile(r"\d{4} \d{4} \d{4} \d{4}")
+CARD_CVV_RE = re.compile(r"\d{3,4}")
+CARD_EXPIRATION_RE = re.compile(r"\d{2}/\d{2}")
 
 
-class ItemInterface(QMetaType):
+class ItemInterface:
+    __slots__ = ()
 
     def group(self) -> "GroupInterface":
         raise NotImpelementedErr("ItemInterface.group is not implemented")
@@ -25,6 +29,9 @@ class ItemInterface(QMetaType):
     def delete(self) -> None:
         raise NotImpelementedErr("ItemInterface.delete is not implemented")
 
+    def verify(self) -> bool:
+        raise NotImplementedError("ItemInterface.verify is not implemented")
+
     def _set_group(self, group: "GroupInterface") -> None:
         raise NotImpelementedErr("ItemInterfaceInternal._set_group is not implemented")
 
@@ -41,36 +48,58 @@ class IDError(Exception):
 
 
 class _BaseItem(ItemInterface):
-    
-    def __init__(self, required_keys: typing.List[str], keys: typing.Dict[str, typing.Callable], data: typing.Dict[str, str]):
-        super().__init__()
+    ''' values are stored by field position, `_SCHEMA` maps fields to validators once per type '''
+    __slots__ = ("_group", "_id", "_values")
+    _REQUIRED: typing.Tuple[str, ...] = ()
+    _SCHEMA: typing.Dict[str, typing.Callable[[str], bool]] = {}
+    _INDEX: typing.Dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._INDEX = {k: i for i, k in enumerate(cls._SCHEMA)}
+
+    def __init__(self, data: typing.Dict[str, str]):
         self._group = None
         self._id = NO_ID
-        self._keys = keys
-        self._data = defaultdict(str)
-        if not set(required_keys) <= set(data.keys()):
+        self._values = [None] * len(self._SCHEMA)
+        if not set(self._REQUIRED) <= data.keys():
             raise ValueError("data required key not specified")
 
         for k, v in data.items():
             self.entry(k, v)
 
+    @classmethod
+    def trusted(cls, data: typing.Dict[str, str]) -> "_BaseItem":
+        ''' builds an item from data that was validated before it was stored, see `verify` '''
+        item = cls.__new__(cls)
+        item._group = None
+        item._id = NO_ID
+        item._values = [data.get(k) for k in cls._SCHEMA]
+        return item
+
     def group(self) -> "GroupInterface":
         return self._group
 
     def data(self) -> typing.Dict[str, str]:
-        return self._data
+        return {k: v for k, v in zip(self._SCHEMA, self._values) if v is not None}
 
     def entry(self, k: str, v: str = None) -> str | None:
-        if k not in self._keys.keys():
+        i = self._INDEX.get(k)
+        if i is None:
             raise KeyError(f"invalid key: {k}")
 
         if v is None:
-            return self._data[k]
+            value = self._values[i]
+            return "" if value is None else value
 
-        if not self._keys[k](v):
+        if not self._SCHEMA[k](v):
             raise ValueError(f"invalid value \"{v}\" for key \"{k}\"")
 
-        self._data[k] = v
+        self._values[i] = v
+        if self.group() and self.group().database():
+            self.group().database()._changes.modify_item(self)
+            self.group().database()._search.update(self)
+
         self._modify()
 
     def delete(self) -> None:
@@ -79,11 +108,16 @@ class _BaseItem(ItemInterface):
         elif not (self.group() and self.group().database()):
             raise GroupError("group or database has not been setted")
 
-        cur = self.group().database()._cursor
-        cur.execute("""
-            DELETE FROM item
-            WHERE id = ?
-        """, [self._id])
+        self.group().remove_item(self)
+
+    def verify(self) -> bool:
+        for (k, check), v in zip(self._SCHEMA.items(), self._values):
+            if v is None and k in self._REQUIRED:
+                return False
+            elif v is not None and not check(v):
+                return False
+
+        return True
 
     def _set_group(self, group: "GroupInterface") -> None:
         if self.group():
@@ -106,30 +140,19 @@ class _BaseItem(ItemInterface):
 
 
 class PasswordItem(_BaseItem):
-
-    def __init__(self, data: typing.Dict[str, str]):
-        super().__init__(
-            required_keys=["url", "login", "password"],
-            keys={
-                "title": PasswordItem.check_title,
-                "url": PasswordItem.check_url,
-                "login": PasswordItem.check_login,
-                "email": PasswordItem.check_email,
-                "password": PasswordItem.check_password,
-                "notes": PasswordItem.check_notes,
-            },
-            data=data,
-        )
+    __slots__ = ()
 
     def check_title(title) -> bool:
         return True
 
+    @functools.lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
     def check_url(url) -> bool:
-        return False if url == "" else validators.url(url)
+        return False if url == "" else validators.url(url) is True
 
     def check_login(login) -> bool:
         return login != ""
 
+    @functools.lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
     def check_email(email) -> bool:
         return True if not email else validators.email(email) is True
 
@@ -139,34 +162,31 @@ class PasswordItem(_BaseItem):
     def check_notes(note) -> bool:
         return True
 
+    _REQUIRED = ("url", "login", "password")
+    _SCHEMA = {
+        "title": check_title,
+        "url": check_url,
+        "login": check_login,
+        "email": check_email,
+        "password": check_password,
+        "notes": check_notes,
+    }
+
 
 class CardItem(_BaseItem):
-    
-    def __init__(self, data: typing.Dict[str, str]):
-        super().__init__(
-            required_keys=["number", "cvv"],
-            keys={
-                "title": CardItem.check_title,
-                "number": CardItem.check_number,
-                "cvv": CardItem.check_cvv,
-                "expiration": CardItem.check_expiration,
-                "holder": CardItem.check_holder,
-                "notes": CardItem.check_notes,
-            },
-            data=data,
-        )
+    __slots__ = ()
 
     def check_title(title) -> bool:
         return True
 
     def check_number(number: str) -> bool:
-        return re.match("\d{4} \d{4} \d{4} \d{4}", number)
+        return CARD_NUMBER_RE.match(number) is not None
 
     def check_cvv(cvv: str) -> bool:
-        return re.match("\d{3,4}", cvv)
+        return CARD_CVV_RE.match(cvv) is not None
 
     def check_expiration(expiration: str) -> bool:
-        return True if not expiration else re.match("\d{2}/\d{2}", expiration)
+        return True if not expiration else CARD_EXPIRATION_RE.match(expiration) is not None
 
     def check_holder(holder: str) -> bool:
         return True
@@ -174,21 +194,19 @@ class CardItem(_BaseItem):
     def check_notes(notes: str) -> bool:
         return True
 
+    _REQUIRED = ("number", "cvv")
+    _SCHEMA = {
+        "title": check_title,
+        "number": check_number,
+        "cvv": check_cvv,
+        "expiration": check_expiration,
+        "holder": check_holder,
+        "notes": check_notes,
+    }
+
 
 class IdentityItem(_BaseItem):
- 
-    def __init__(self, data: typing.Dict[str, str]):
-        super().__init__(
-            required_keys=["full_name"],
-            keys={
-                "title": IdentityItem.check_title,
-                "full_name": IdentityItem.check_full_name,
-                "phone": IdentityItem.check_phone,
-                "email": IdentityItem.check_email,
-                "notes": IdentityItem.check_notes,
-            },
-            data=data,
-        )
+    __slots__ = ()
 
     def check_title(title: str) -> bool:
         return True
@@ -196,6 +214,7 @@ class IdentityItem(_BaseItem):
     def check_full_name(full_name: str) -> bool:
         return full_name != ""
 
+    @functools.lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
     def check_phone(phone: str) -> bool:
         if not phone:
             return True
@@ -203,8 +222,26 @@ class IdentityItem(_BaseItem):
         ph = phonenumbers.parse(phone)
         return phonenumbers.is_valid_number(ph)
 
+    @functools.lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
     def check_email(email: str) -> bool:
         return True if not email else validators.email(email) is True
 
     def check_notes(notes: str) -> bool:
         return True
+
+    _REQUIRED = ("full_name",)
+    _SCHEMA = {
+        "title": check_title,
+        "full_name": check_full_name,
+        "phone": check_phone,
+        "email": check_email,
+        "notes": check_notes,
+    }
+
+
+def clear_caches() -> None:
+    ''' forgets the values remembered by the cached checks, they are plaintext of opened databases '''
+    for item_type in (PasswordItem, CardItem, IdentityItem):
+        for check in item_type._SCHEMA.values():
+            if hasattr(check, "cache_clear"):
+                check.cache_clear()
@@ -2,8 +2,6 @@
 import typing
 from enum import Enum
 
-from PyQt5.QtCore import QMetaType
-
 from lib.crypto.hasher import HashInterface
 from lib.crypto.cipher import CipherInterface
 from lib.crypto.encoder import EncoderInterface
@@ -17,11 +15,27 @@ class Status(Enum):
     MODIFIED = "Modified"
 
 
+class Pool(Enum):
+    THREAD = "Thread"
+    PROCESS = "Process"
+
+
+class Event(Enum):
+    STATUS_CHANGED = "StatusChanged"
+    RENAMED = "Renamed"
+    GROUP_ADDED = "GroupAdded"
+    GROUP_REMOVED = "GroupRemoved"
+    GROUP_RENAMED = "GroupRenamed"
+
+
 class ClosedError(Exception):
     ...
 
 
-class DatabaseInterface(QMetaType):
+Listener = typing.Callable[["DatabaseInterface", Event, typing.Optional["GroupInterface"]], None]
+
+
+class DatabaseInterface:
 
     def location(self) -> str:
         raise NotImplementedError("DatabaseInterface.location is not implemented")
@@ -44,29 +58,53 @@ class DatabaseInterface(QMetaType):
     def encoder(self, new_encoder: EncoderInterface = None) -> EncoderInterface | None:
         raise NotImplementedError("DatabaseInterface.encoder is not implemented")
 
-    def open(self, master_key: str) -> None:
+    def open(self, master_key: str, workers: int = 1, pool: Pool = Pool.THREAD) -> None:
         raise NotImplementedError("DatabaseInterface.open is not implemented")
 
     def close(self) -> None:
         raise NotImplementedError("DatabaseInterface.close is not implemented")
 
-    def save(self) -> None:
+    def save(self, chunk_size: int = 0) -> None:
         raise NotImplementedError("DatabaseInterface.save is not implemented")
 
     def group(self, name: str) -> "GroupInterface":
         raise NotImplementedError("DatabaseInterface.group is not implemented")
 
-    def groups(self) -> typing.List["GroupInterface"]:
+    def groups(self) -> typing.Sequence["GroupInterface"]:
         raise NotImplementedError("DatabaseInterface.groups is not implemented")
 
+    def index_of(self, group: "GroupInterface") -> int:
+        raise NotImplementedError("DatabaseInterface.index_of is not implemented")
+
     def add_group(self, group: "GroupInterface") -> None:
         raise NotImplementedError("DatabaseInterface.add_group is not implemented")
 
+    def add_groups(self, groups: typing.Iterable["GroupInterface"]) -> None:
+        raise NotImplementedError("DatabaseInterface.add_groups is not implemented")
+
     def remove(self) -> None:
         raise NotImplementedError("DatabaseInterface.remove is not implemented")
 
     def remove_group(self, group: "GroupInterface") -> None:
         raise NotImplementedError("DatabaseInterface.delete_group is not implemented")
 
+    def verify(self) -> typing.List["ItemInterface"]:
+        raise NotImplementedError("DatabaseInterface.verify is not implemented")
+
+    def search(self, query: str, limit: int = 50) -> typing.List["Match"]:
+        raise NotImplementedError("DatabaseInterface.search is not implemented")
+
+    def find(self, title: str = None, url: str = None, login: str = None) -> typing.List["Match"]:
+        raise NotImplementedError("DatabaseInterface.find is not implemented")
+
+    def lookup_by_url(self, url: str, limit: int = 50) -> typing.List["Match"]:
+        raise NotImplementedError("DatabaseInterface.lookup_by_url is not implemented")
+
+    def listen(self, listener: Listener) -> None:
+        raise NotImplementedError("DatabaseInterface.listen is not implemented")
+
+    def unlisten(self, listener: Listener) -> None:
+        raise NotImplementedError("DatabaseInterface.unlisten is not implemented")
+
     def __eq__(self, other):
         return self.location() == other.location()
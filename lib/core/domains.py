@@ -0,0 +1,109 @@
+import re
+import typing
+
+
+# suffixes under which sites are registered, beside single label top level domains. This is a
+# short list of the common ones, not the whole public suffix list
+PUBLIC_SUFFIXES = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk", "net.uk", "sch.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "co.nz", "org.nz", "net.nz",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp", "co.kr", "or.kr", "com.cn", "net.cn", "org.cn",
+    "com.hk", "com.tw", "com.sg", "com.my", "com.ph", "co.id", "co.in", "net.in", "org.in", "co.th",
+    "co.za", "org.za", "co.il", "com.tr", "com.ua", "com.pl", "com.br", "net.br", "org.br",
+    "com.ar", "com.mx", "com.co",
+    # hosting services that give every user its own site
+    "github.io", "gitlab.io", "blogspot.com", "appspot.com", "herokuapp.com", "netlify.app",
+    "vercel.app", "pages.dev", "web.app", "firebaseapp.com", "azurewebsites.net", "cloudfront.net",
+})
+MAX_SUFFIX_LABELS = max(s.count(".") + 1 for s in PUBLIC_SUFFIXES)
+
+IP_RE = re.compile(r"\d+(?:\.\d+){3}")
+
+
+def labels(host: str) -> typing.List[str]:
+    ''' labels of a normalized host from the top level domain down, addresses are kept whole '''
+    host = host.strip(".")
+    if not host or IP_RE.fullmatch(host):
+        return [host] if host else []
+
+    return host.split(".")[::-1]
+
+
+def suffix_length(labels: typing.Sequence[str]) -> int:
+    ''' number of labels of the public suffix of reversed `labels` '''
+    for n in range(min(len(labels), MAX_SUFFIX_LABELS), 1, -1):
+        if ".".join(reversed(labels[:n])) in PUBLIC_SUFFIXES:
+            return n
+
+    return 1
+
+
+class _Node:
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children = {}
+        self.keys = []
+
+
+class DomainTrie:
+    ''' keys by host, labels are stored reversed so every host of a site is under the node of the site '''
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, host: str, key: int) -> None:
+        node = self._root
+        for label in labels(host):
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _Node()
+            node = child
+
+        node.keys.append(key)
+
+    def remove(self, host: str, key: int) -> None:
+        node = self._root
+        for label in labels(host):
+            node = node.children.get(label)
+            if node is None:
+                return
+
+        if key in node.keys:
+            node.keys.remove(key)
+
+    def lookup(self, host: str) -> typing.Iterator[typing.Tuple[int, int]]:
+        ''' (score, key) of the host, its parent domains and other hosts of its site
+
+        Scores are twice the number of labels shared with `host`, plus one for the host and its
+        parents, so "example.com" ranks above "mail.example.com" for "login.example.com".
+        Domains above the site, like "co.uk", only match themselves.
+        '''
+        path = labels(host)
+        site = suffix_length(path) + 1
+        nodes = []
+        node = self._root
+        for label in path:
+            node = node.children.get(label)
+            if node is None:
+                break
+            nodes.append(node)
+
+        for depth, node in enumerate(nodes, 1):
+            if depth == len(path) or depth >= site:
+                yield from ((2 * depth + 1, key) for key in node.keys)
+
+            if depth < site:
+                continue
+
+            on_path = nodes[depth] if depth < len(nodes) else None
+            for child in node.children.values():
+                if child is not on_path:
+                    yield from self.__subtree(child, 2 * depth)
+
+    def __subtree(self, node: _Node, score: int) -> typing.Iterator[typing.Tuple[int, int]]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from ((score, key) for key in node.keys)
+            stack.extend(node.children.values())
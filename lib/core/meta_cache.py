@@ -0,0 +1,66 @@
+import os
+import typing
+import tempfile
+import yaml
+
+
+def dump(data: typing.Any, path: str) -> None:
+    ''' writes yaml to a temporary file and renames it over `path` '''
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as yaml_file:
+            yaml.safe_dump(data, yaml_file)
+
+        os.replace(tmp, path)
+    except:
+        os.remove(tmp)
+        raise
+
+
+def stat(location: str) -> typing.Tuple[int, float] | None:
+    try:
+        st = os.stat(location)
+    except OSError:
+        return None
+
+    return st.st_size, st.st_mtime
+
+
+class MetaCache:
+    ''' name and algorithm ids of registered databases, keyed by location '''
+
+    def __init__(self, path: str):
+        self._path = path
+        self._entries = {}
+
+    def load(self) -> None:
+        if not os.path.isfile(self._path):
+            return
+
+        with open(self._path, "r") as yaml_file:
+            self._entries = yaml.safe_load(yaml_file) or {}
+
+    def save(self) -> None:
+        dump(self._entries, self._path)
+
+    def get(self, location: str) -> typing.Dict[str, typing.Any] | None:
+        return self._entries.get(location)
+
+    def put(self, location: str, meta: typing.Dict[str, typing.Any]) -> None:
+        st = stat(location)
+        self._entries[location] = {
+            "name": meta["name"],
+            "size": st[0] if st else None,
+            "mtime": st[1] if st else None,
+            "hasher": meta["hasher"].id().value,
+            "cipher": meta["cipher"].id().value,
+            "encoder": meta["encoder"].id().value,
+        }
+
+    def remove(self, location: str) -> None:
+        self._entries.pop(location, None)
+
+    def stale(self, location: str) -> bool:
+        entry = self._entries.get(location)
+        st = stat(location)
+        return entry is None or st is None or (entry["size"], entry["mtime"]) != st
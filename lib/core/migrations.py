@@ -0,0 +1,119 @@
+import sqlite3
+import typing
+
+
+class MigrationError(Exception):
+    ...
+
+
+def _v1(cursor: sqlite3.Cursor) -> None:
+    ''' index items by group, drop rows left behind by unenforced foreign keys '''
+    cursor.execute("""
+        DELETE FROM item
+        WHERE group_name NOT IN (SELECT name FROM `group`)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS item_group_name
+        ON item(group_name)
+    """)
+
+
+def _v2(cursor: sqlite3.Cursor) -> None:
+    ''' key groups by integer id, so renaming a group touches a single row '''
+    seq = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'item'").fetchone()
+    cursor.execute("""
+        CREATE TABLE group_v2 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            type TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO group_v2(name, type)
+        SELECT name, type FROM `group` ORDER BY rowid
+    """)
+    cursor.execute("""
+        CREATE TABLE item_v2 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER NOT NULL,
+            data BLOB NOT NULL,
+
+            FOREIGN KEY(group_id) REFERENCES `group`(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO item_v2(id, group_id, data)
+        SELECT item.id, group_v2.id, item.data
+        FROM item JOIN group_v2 ON group_v2.name = item.group_name
+    """)
+    cursor.execute("DROP TABLE item")
+    cursor.execute("DROP TABLE `group`")
+    cursor.execute("ALTER TABLE group_v2 RENAME TO `group`")
+    cursor.execute("ALTER TABLE item_v2 RENAME TO item")
+    cursor.execute("""
+        CREATE INDEX item_group_id
+        ON item(group_id)
+    """)
+    if seq is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = 'item'", [seq[0]])
+
+
+def _v3(cursor: sqlite3.Cursor) -> None:
+    ''' blind index of item tokens, empty until a master key builds it and sets `meta.index_check` '''
+    cursor.execute("ALTER TABLE meta ADD COLUMN index_check BLOB")
+    cursor.execute("""
+        CREATE TABLE item_index (
+            token BLOB NOT NULL,
+            item_id INTEGER NOT NULL,
+
+            PRIMARY KEY(token, item_id),
+            FOREIGN KEY(item_id) REFERENCES item(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE INDEX item_index_item_id
+        ON item_index(item_id)
+    """)
+
+
+MIGRATIONS: typing.List[typing.Callable[[sqlite3.Cursor], None]] = [
+    _v1,
+    _v2,
+    _v3,
+]
+
+VERSION = len(MIGRATIONS)
+
+
+def version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def upgrade(connection: sqlite3.Connection) -> None:
+    current = version(connection)
+    if current > VERSION:
+        raise MigrationError(f"unsupported schema version {current}, latest known is {VERSION}")
+
+    if current == VERSION:
+        return
+
+    # tables are rebuilt with foreign keys off and checked before each commit
+    foreign_keys = connection.execute("PRAGMA foreign_keys").fetchone()[0]
+    connection.execute("PRAGMA foreign_keys = OFF")
+    try:
+        for number in range(current + 1, VERSION + 1):
+            cursor = connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                MIGRATIONS[number - 1](cursor)
+                if cursor.execute("PRAGMA foreign_key_check").fetchone() is not None:
+                    raise MigrationError(f"migration {number} broke foreign keys")
+
+                cursor.execute(f"PRAGMA user_version = {number}")
+            except:
+                connection.rollback()
+                raise
+
+            connection.commit()
+    finally:
+        connection.execute(f"PRAGMA foreign_keys = {foreign_keys}")
@@ -0,0 +1,56 @@
+import sqlite3
+from enum import Enum
+
+
+class Profile(Enum):
+    DURABLE = "Durable"
+    BALANCED = "Balanced"
+    FAST = "Fast"
+
+
+DEFAULT_PROFILE = Profile.DURABLE
+
+PRAGMAS = {
+    # sqlite defaults: rollback journal, fsync on every commit
+    Profile.DURABLE: {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    },
+    # WAL fsyncs only on checkpoints, a power loss may drop the last commits but never corrupts the file
+    Profile.BALANCED: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+    },
+    # no fsync at all, an OS crash may corrupt the file
+    Profile.FAST: {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def from_value(value: str) -> Profile:
+    try:
+        return Profile(value)
+    except ValueError:
+        return DEFAULT_PROFILE
+
+
+def apply(connection: sqlite3.Connection, profile: Profile) -> None:
+    for pragma, value in PRAGMAS[profile].items():
+        connection.execute(f"PRAGMA {pragma} = {value}").fetchall()
+
+
+def connect(location: str, profile: Profile) -> sqlite3.Connection:
+    connection = sqlite3.connect(location)
+    apply(connection, profile)
+    return connection
@@ -0,0 +1,83 @@
+import typing
+
+
+class GroupRegistry:
+    ''' groups of a database in insertion order, looked up by name or id '''
+
+    def __init__(self):
+        # groups are keyed by identity: {id(group): group}
+        self._groups = {}
+        self._names = {}
+        self._ids = {}
+        self._view = None
+        self._positions = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def get(self, name: str) -> "GroupInterface":
+        return self._names[name]
+
+    def get_id(self, id_: int) -> "GroupInterface":
+        group = self._ids.get(id_)
+        # ids are assigned on save, so the map is rebuilt when it misses
+        if group is None or group._id != id_:
+            self._ids = {g._id: g for g in self._groups.values()}
+            group = self._ids[id_]
+
+        return group
+
+    def view(self) -> typing.Tuple["GroupInterface", ...]:
+        if self._view is None:
+            self._view = tuple(self._groups.values())
+
+        return self._view
+
+    def index_of(self, group: "GroupInterface") -> int:
+        if self._positions is None:
+            self._positions = {id(g): pos for pos, g in enumerate(self.view())}
+
+        pos = self._positions.get(id(group))
+        if pos is None:
+            raise ValueError(f"Group with name {group.name()} is not exist")
+
+        return pos
+
+    def add(self, group: "GroupInterface") -> None:
+        self.add_many([group])
+
+    def add_many(self, groups: typing.Sequence["GroupInterface"]) -> None:
+        names = [group.name() for group in groups]
+        if len(set(names)) != len(names):
+            raise ValueError("Group names are not unique")
+
+        for name in names:
+            if name in self._names:
+                raise ValueError(f"Group with name {name} already exist")
+
+        for group in groups:
+            self._groups[id(group)] = group
+            self._names[group.name()] = group
+
+        self._invalidate()
+
+    def rename(self, group: "GroupInterface", new_name: str) -> None:
+        if new_name in self._names:
+            raise ValueError(f"Group with name {new_name} already exist")
+
+        self._names[new_name] = self._names.pop(group.name())
+
+    def remove(self, group: "GroupInterface") -> None:
+        if self._groups.pop(id(group), None) is None:
+            raise ValueError(f"Group with name {group.name()} is not exist")
+
+        del self._names[group.name()]
+        self._ids.pop(group._id, None)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._view = None
+        self._positions = None
@@ -0,0 +1,368 @@
+import re
+import heapq
+import typing
+import threading
+
+from .data.item import NO_ID, ItemInterface
+from .domains import DomainTrie
+
+
+RESULT_LIMIT = 50
+# entries scored by a query at most, ranking stops there when the bounds of the buckets of terms shared by
+# most entries do not stop it earlier, the results are then the best of the entries in the best buckets
+SCORE_LIMIT = 5000
+
+# searchable fields and their weight in the ranking
+FIELDS = {
+    "title": 4,
+    "url": 3,
+    "login": 2,
+    "email": 2,
+    "holder": 1,
+    "full_name": 1,
+}
+WEIGHTS = tuple(sorted(set(FIELDS.values()), reverse=True))
+DETAIL_FIELDS = ("login", "email", "holder", "full_name", "url")
+
+TOKEN_RE = re.compile(r"\w+")
+HOST_RE = re.compile(r"(?:[a-z][a-z0-9+.-]*:)?//(?:[^@/?#]*@)?([^/?#:]*)")
+
+# an item in memory, or the id of a stored row that was indexed without loading its group
+Ref = typing.Union[ItemInterface, int]
+
+
+class Match(typing.NamedTuple):
+    score: int
+    group: "GroupInterface"
+    ref: Ref
+    title: str
+    detail: str
+
+
+class _Entry(typing.NamedTuple):
+    group: "GroupInterface"
+    ref: Ref
+    title: str
+    detail: str
+    # tokens of the fields of each weight in `WEIGHTS`, separated and surrounded by spaces: (" my bank ", ...)
+    texts: typing.Tuple[str, ...]
+    host: str
+
+
+def host(url: str) -> str:
+    url = url.casefold()
+    match = HOST_RE.match(url if "//" in url else "//" + url)
+    return match.group(1) if match else ""
+
+
+def tokens(data: typing.Dict[str, str]) -> typing.Dict[int, typing.List[str]]:
+    ''' tokens of the searchable fields grouped by field weight '''
+    result = {}
+    for field, weight in FIELDS.items():
+        value = data.get(field)
+        if value:
+            result.setdefault(weight, []).extend(TOKEN_RE.findall(host(value) if field == "url" else value.casefold()))
+
+    return result
+
+
+def grams(tokens: typing.Iterable[str]) -> typing.Set[str]:
+    ''' trigrams of the tokens, padding marks their one and two letter prefixes as "^^a" and "^ab"
+    and their end as "ab$" '''
+    return {p[i:i + 3] for p in ("^^" + t + "$" for t in tokens) for i in range(len(p) - 2)}
+
+
+def _start(term: str) -> str:
+    ''' gram of the tokens starting like the term '''
+    return "^" * max(0, 2 - len(term)) + "^" + term[:2]
+
+
+def _end(term: str) -> str:
+    ''' gram of the tokens ending like the term '''
+    return ("^^" + term + "$")[-3:]
+
+
+def describe(data: typing.Dict[str, str]) -> typing.Tuple[str, str]:
+    ''' title and detail line shown for a match '''
+    return data.get("title") or "", next((data[f] for f in DETAIL_FIELDS if data.get(f)), "")
+
+
+def item_of(match: Match) -> ItemInterface:
+    ''' the item of a match, loads its group if the item was indexed from a stored row '''
+    if not isinstance(match.ref, int):
+        return match.ref
+
+    for item in match.group.items():
+        if item._id == match.ref:
+            return item
+
+    raise ValueError("item is not in group")
+
+
+class SearchIndex:
+    ''' inverted index over the searchable fields of an opened database, kept only in memory
+
+    Entries are built by a background thread from stored rows and replaced by the items
+    the database reports as changed, so keys touched during the build win over the rows
+    the thread read before the change.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._active = False
+        self._ready = False
+        self.__reset()
+
+    def __reset(self) -> None:
+        # {key: _Entry}, keys are row ids or -id(item) for items that are not saved yet
+        self._entries = {}
+        # {weight + gram: keys}, keys are appended to lists and turned into sets when a query first reads them,
+        # removed and replaced entries stay in them and are dropped by the lookup in `_entries`
+        self._grams = {}
+        self._hosts = DomainTrie()
+        self._touched = set()
+        # groups removed during a build, their rows are not added: {id(group): group}
+        self._removed = {}
+
+    def active(self) -> bool:
+        return self._active
+
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def begin(self) -> int:
+        ''' starts a build and returns its generation, entries of older builds are ignored '''
+        with self._lock:
+            self._generation += 1
+            self._active = True
+            self._ready = False
+            self.__reset()
+            return self._generation
+
+    def add_many(self, generation: int, rows: typing.Iterable[typing.Tuple["GroupInterface", Ref, typing.Dict[str, str]]]) -> bool:
+        ''' adds rows read by a build, returns False once the build is outdated '''
+        with self._lock:
+            if generation != self._generation:
+                return False
+
+            for group, ref, data in rows:
+                key = self.__key(ref)
+                if key not in self._touched:
+                    self.__add(key, group, ref, data)
+
+            return True
+
+    def finish(self, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._touched.clear()
+                self._removed.clear()
+                self._ready = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._active = False
+            self._ready = False
+            self.__reset()
+
+    def update(self, item: ItemInterface) -> None:
+        if not self._active:
+            return
+
+        with self._lock:
+            key = self.__key(item)
+            self._touched.add(key)
+            self.__add(key, item.group(), item, item.data())
+
+    def remove(self, item: ItemInterface) -> None:
+        if not self._active:
+            return
+
+        with self._lock:
+            key = self.__key(item)
+            self._touched.add(key)
+            self.__pop(key)
+
+    def remove_group(self, group: "GroupInterface") -> None:
+        if not self._active:
+            return
+
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.group is group]:
+                self.__pop(key)
+
+            if not self._ready:
+                self._removed[id(group)] = group
+
+    def rekey(self, item: ItemInterface) -> None:
+        ''' moves a saved item from its temporary key to its row id '''
+        if not self._active:
+            return
+
+        with self._lock:
+            entry = self.__pop(-id(item))
+            if entry is None:
+                return
+
+            self._touched.add(item._id)
+            self.__add(item._id, entry.group, item, item.data())
+
+    def search(self, query: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        ''' best `limit` entries containing every query term, equal scores are in no particular order '''
+        terms = TOKEN_RE.findall(query.casefold())
+        if not terms:
+            return []
+
+        patterns = [(f" {term} ", f" {term}", term) for term in terms]
+
+        with self._lock:
+            by_term = {term: self.__candidates(term) for term in set(terms)}
+            if not all(by_term.values()):
+                return []
+
+            # entries are ranked in buckets of the term found in the fewest entries: whole token, prefix or
+            # substring in the fields of each weight. A bucket bounds the score of its entries, so ranking
+            # stops once no remaining bucket can improve the results and entries sharing a broad term are
+            # not all scored. Buckets are intersections of posting sets that are tested per entry instead of
+            # being built
+            rarest = min(by_term, key=lambda term: sum(min(map(len, sets)) for sets in by_term[term].values()))
+            others = sum(self.__bound(term, by_weight) for term, by_weight in by_term.items() if term != rarest)
+            best = []
+            seen = set()
+            entries = self._entries
+            for bound, sets in self.__buckets(rarest, by_term[rarest]):
+                bound += others
+                if len(best) == limit and best[0][0] >= bound or len(seen) >= SCORE_LIMIT:
+                    break
+
+                first, rest = sets[0], sets[1:]
+                for key in first:
+                    # entries of earlier buckets are in later ones too
+                    if key in seen or not all(key in keys for keys in rest):
+                        continue
+
+                    seen.add(key)
+                    entry = entries.get(key)
+                    score = entry and self.__score(entry.texts, patterns)
+                    if not score:
+                        continue
+
+                    if len(best) < limit:
+                        heapq.heappush(best, (score, len(best), key))
+                    elif score > best[0][0]:
+                        heapq.heapreplace(best, (score, best[0][1], key))
+                    if len(best) == limit and best[0][0] >= bound or len(seen) >= SCORE_LIMIT:
+                        break
+
+            return [Match(score, *entries[key][:4]) for score, _, key in sorted(best, key=lambda b: -b[0])]
+
+    def lookup(self, url: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        ''' entries of the host of `url`, of its parent domains and of other hosts of its site, closest first '''
+        with self._lock:
+            best = heapq.nlargest(limit, self._hosts.lookup(host(url)), key=lambda pair: pair[0])
+            return [Match(score, *self._entries[key][:4]) for score, key in best]
+
+    def __candidates(self, term: str) -> typing.Dict[int, typing.List[typing.Set[int]]]:
+        ''' posting sets of the grams of the term in the fields of each weight, an entry containing
+        the term is in all sets of a weight '''
+        result = {}
+        for weight in WEIGHTS:
+            if len(term) < 3:
+                sets = [self.__posting(self._grams, f"{weight}{_start(term)}")]
+            else:
+                sets = [self.__posting(self._grams, f"{weight}{gram}") for gram in grams([term])
+                        if gram[0] != "^" and gram[-1] != "$"]
+            if all(sets):
+                result[weight] = sets
+
+        return result
+
+    def __buckets(self, term: str, by_weight: typing.Dict[int, typing.List[typing.Set[int]]]) -> typing.Iterator[typing.Tuple[int, typing.List[typing.Set[int]]]]:
+        ''' (highest score, posting sets) of the entries with the term as a whole token, a prefix or a
+        substring in the fields of each weight, best first, the smallest set is first '''
+        for bound, weight, kind in sorted(((kind * weight, weight, kind) for weight in by_weight for kind in (3, 2, 1)),
+                                          reverse=True):
+            sets = list(by_weight[weight])
+            if kind > 1:
+                sets.append(self.__posting(self._grams, f"{weight}{_start(term)}"))
+            if kind > 2:
+                sets.append(self.__posting(self._grams, f"{weight}{_end(term)}"))
+
+            yield bound, sorted(sets, key=len)
+
+    def __bound(self, term: str, by_weight: typing.Dict[int, typing.List[typing.Set[int]]]) -> int:
+        ''' highest score of the term in any entry, the bound of its best bucket that is not empty '''
+        for bound, sets in self.__buckets(term, by_weight):
+            if any(all(key in keys for keys in sets[1:]) for key in sets[0]):
+                return bound
+
+        return 0
+
+    @staticmethod
+    def __score(texts: typing.Tuple[str, ...], patterns: typing.List[typing.Tuple[str, str, str]]) -> int:
+        # whole tokens rank above prefixes, prefixes above other substrings, every term has to be found
+        score = 0
+        for token, prefix, term in patterns:
+            best = 0
+            for weight, text in zip(WEIGHTS, texts):
+                if term in text:
+                    best = max(best, 3 * weight if token in text else 2 * weight if prefix in text else weight)
+
+            if not best:
+                return 0
+
+            score += best
+
+        return score
+
+    def __posting(self, postings: typing.Dict[str, typing.List[int] | typing.Set[int]], name: str) -> typing.Set[int]:
+        keys = postings.get(name)
+        if keys is None:
+            return set()
+        elif isinstance(keys, list):
+            keys = postings[name] = set(keys)
+
+        return keys
+
+    def __key(self, ref: Ref) -> int:
+        if isinstance(ref, int):
+            return ref
+
+        return ref._id if ref._id != NO_ID else -id(ref)
+
+    def __add(self, key: int, group: "GroupInterface", ref: Ref, data: typing.Dict[str, str]) -> None:
+        if id(group) in self._removed:
+            return
+
+        fields = tokens(data)
+        texts = tuple(" " + " ".join(fields[weight]) + " " if weight in fields else "" for weight in WEIGHTS)
+        name = host(data["url"]) if data.get("url") else ""
+        self.__pop(key)
+        self._entries[key] = _Entry(group, ref, *describe(data), texts, name)
+        if name:
+            self._hosts.add(name, key)
+
+        postings = self._grams
+        for weight, words in fields.items():
+            for gram in grams(words):
+                name = f"{weight}{gram}"
+                keys = postings.get(name)
+                if keys is None:
+                    postings[name] = [key]
+                elif isinstance(keys, list):
+                    keys.append(key)
+                else:
+                    keys.add(key)
+
+    def __pop(self, key: int) -> _Entry | None:
+        # grams of the entry are left to the lookup in `_entries`, but its host is removed
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.host:
+            self._hosts.remove(entry.host, key)
+
+        return entry
@@ -3,10 +3,19 @@ import os
 import sqlite3
 import typing
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import lib.core.data.item as libitem
 import lib.core.data.factory as factory
-from .database import DatabaseInterface, ClosedError, Status, SALT_LENGTH
+from .database import DatabaseInterface, ClosedError, Status, Pool, Event, Listener, SALT_LENGTH
+from .changes import ChangeSet
+from .registry import GroupRegistry
+from .search import SearchIndex, Match, RESULT_LIMIT, describe
+from . import blind_index
+from . import profile as libprofile
+from . import connection as libconnection
+from . import migrations
 from .data.group import GroupInterface
 from .data.item import ItemInterface
 
@@ -16,6 +25,44 @@ from lib.crypto import hasher as libhasher
 from lib.crypto import encoder as libencoder
 
 
+DECRYPT_CHUNK_SIZE = 2048
+
+
+
+def _decrypt_chunk(key: libcipher.KeyInterface, encoder: libencoder.EncoderInterface,
+        data: typing.Sequence[bytes]) -> typing.List[typing.Dict[str, str]]:
+    return [json.loads(d) for d in key.decrypt_many(encoder.decode_many(data))]
+
+
+def _index_rows(index: SearchIndex, generation: int, location: str, key: libcipher.KeyInterface,
+        encoder: libencoder.EncoderInterface, groups: typing.Dict[int, GroupInterface], skipped: typing.Set[int],
+        items: typing.Sequence[ItemInterface]) -> None:
+    if not index.add_many(generation, [(item.group(), item, item.data()) for item in items]):
+        return
+
+    after = 0
+    try:
+        with libconnection.read_only(location) as connection:
+            # short statements, so a save from the gui thread is not blocked by a long read
+            while groups:
+                rows = connection.execute("""
+                    SELECT id, group_id, data FROM item WHERE id > ? ORDER BY id LIMIT ?
+                """, [after, DECRYPT_CHUNK_SIZE]).fetchall()
+                if not rows:
+                    break
+
+                after = rows[-1][0]
+                rows = [r for r in rows if r[1] in groups and r[0] not in skipped]
+                data = _decrypt_chunk(key, encoder, [r[2] for r in rows])
+                if not index.add_many(generation, [(groups[r[1]], r[0], d) for r, d in zip(rows, data)]):
+                    return
+    except sqlite3.Error:
+        # the database was removed or replaced, the index stays unfinished
+        return
+
+    index.finish(generation)
+
+
 class _BaseState:
 
     def __init__(self, database: "SQLiteDatabase"):
@@ -49,49 +96,79 @@ class _ClosedState(_BaseState):
     def encoder(self, new_encoder: libencoder.EncoderInterface = None) -> libencoder.EncoderInterface | None:
         raise ClosedError("database closed")
 
-    def open(self, master_key: str) -> None:
-        if self._database._connection is None:
-            self._database._connection = sqlite3.connect(self._database.location())
-            self._database._cursor = self._database._connection.cursor()
+    def verify(self) -> typing.List[ItemInterface]:
+        raise ClosedError("database closed")
+
+    def open(self, master_key: str, workers: int = 1, pool: Pool = Pool.THREAD) -> None:
+        if not self._loaded_previosly:
+            self._database._load_meta()
 
+        # the key is checked first, so a wrong one neither upgrades the schema nor leaves a connection open
         if not self._valid_master_key(master_key):
             raise ValueError("incorrect master key")
 
+        try:
+            migrations.upgrade(self._database._connection)
+        except:
+            libconnection.POOL.release(self._database.location())
+            raise
+
+        self._database._workers = workers
+        self._database._pool = pool
         if self._loaded_previosly:
             self._database._set_state(self._database._opened_state)
+            self._database._build_search_index()
             return
 
-        dec = self._decrypt_func(master_key)
-        for group in self._load_groups():
-            self._load_items(dec, group)
-            self._database._groups[group.name()] = group
+        self._database._master_key = master_key
+        groups = list(self._load_groups())
+        sizes = dict(self._database._cursor.execute("SELECT group_id, count(*) FROM item GROUP BY group_id"))
+        for group in groups:
+            group._set_loader(self._database._load_items, sizes.get(group._id, 0))
             group._set_database(self._database)
 
+        self._database._groups.add_many(groups)
+
         self._loaded_previosly = True
-        self._database._master_key = master_key
         self._database._set_state(self._database._opened_state)
+        self._database._build_search_index()
 
     def close(self) -> None:
         ...
 
-    def save(self) -> None:
+    def save(self, chunk_size: int = 0) -> None:
         raise ClosedError("database closed")
 
     def group(self, name: str) -> "GroupInterface":
         raise ClosedError("database closed")
 
-    def groups(self) -> typing.List["GroupInterface"]:
+    def groups(self) -> typing.Sequence["GroupInterface"]:
+        raise ClosedError("database closed")
+
+    def index_of(self, group: "GroupInterface") -> int:
         raise ClosedError("database closed")
 
     def add_group(self, group: "GroupInterface") -> None:
         raise ClosedError("database closed")
 
+    def add_groups(self, groups: typing.Iterable["GroupInterface"]) -> None:
+        raise ClosedError("database closed")
+
     def remove(self) -> None:
         raise ClosedError("database closed")
 
     def remove_group(self, group: "GroupInterface") -> None:
         raise ClosedError("database closed")
 
+    def search(self, query: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        raise ClosedError("database closed")
+
+    def find(self, title: str = None, url: str = None, login: str = None) -> typing.List[Match]:
+        raise ClosedError("database closed")
+
+    def lookup_by_url(self, url: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        raise ClosedError("database closed")
+
     def _valid_master_key(self, master_key: str) -> bool:
         if self._database._master_key is not None:
             return self._database._master_key == master_key
@@ -102,33 +179,13 @@ class _ClosedState(_BaseState):
         hs = self._database._meta["hash_salt"]
         return mkh == e.encode(h.hash(master_key.encode(), hs))
 
-    def _decrypt_func(self, master_key: str) -> typing.Callable[[bytes], str]:
-        def decrypt(data: bytes):
-            decoded = self._database._meta["encoder"].decode(data)
-            decrypted = self._database._meta["cipher"].decrypt(
-                decoded,
-                master_key.encode(),
-                self._database._meta["cipher_salt"]
-            )
-            return decrypted.decode('utf-8')
-
-        return decrypt
-
     def _load_groups(self) -> GroupInterface:
-        res = self._database._cursor.execute("SELECT name, type FROM `group`").fetchall()
+        res = self._database._cursor.execute("SELECT id, name, type FROM `group` ORDER BY id").fetchall()
         for r in res: 
-            group = factory.group_from_type(r[1])(name=r[0], items=[])
+            group = factory.group_from_type(r[2])(name=r[1], items=[])
+            group._set_id(r[0])
             yield group
 
-    def _load_items(self, dec: typing.Callable[[bytes], str], group: GroupInterface) -> None:
-        res = self._database._cursor.execute("""
-            SELECT id, data FROM item WHERE group_name = ?
-        """, [group.name()]).fetchall()
-        for i in res:
-            item = factory.item_from_type(group.type())(json.loads(dec(i[1])))
-            item._set_id(i[0])
-            group.add_item(item)
-
 
 class _OpenedState(_BaseState):
 
@@ -139,7 +196,9 @@ class _OpenedState(_BaseState):
             return
 
         self._database._meta["name"] = new_name
+        self._database._changes.modify_meta()
         self._database._set_state(self._database._modified_state)
+        self._database._notify(Event.RENAMED)
 
     def status(self) -> Status:
         return Status.OPENED
@@ -150,7 +209,11 @@ class _OpenedState(_BaseState):
         elif new_master_key == self._database._master_key:
             return
 
+        self._database._prefetch()
         self._database._master_key = new_master_key
+        self._database._key = None
+        self._database._index_key = None
+        self._database._changes.modify_meta(reencrypt=True)
         self._database._set_state(self._database._modified_state)
 
     def hasher(self, new_hasher: libhasher.HashInterface = None) -> libhasher.HashInterface | None:
@@ -160,6 +223,7 @@ class _OpenedState(_BaseState):
             return
 
         self._database._meta["hasher"] = new_hasher
+        self._database._changes.modify_meta()
         self._database._set_state(self._database._modified_state)
 
     def cipher(self, new_cipher: libcipher.CipherInterface = None) -> libcipher.CipherInterface | None:
@@ -168,7 +232,10 @@ class _OpenedState(_BaseState):
         elif new_cipher == self._database._meta["cipher"]:
             return
 
+        self._database._prefetch()
         self._database._meta["cipher"] = new_cipher
+        self._database._key = None
+        self._database._changes.modify_meta(reencrypt=True)
         self._database._set_state(self._database._modified_state)
 
     def encoder(self, new_encoder: libencoder.EncoderInterface = None) -> libencoder.EncoderInterface | None:
@@ -177,33 +244,53 @@ class _OpenedState(_BaseState):
         elif new_encoder == self._database._meta["encoder"]:
             return
 
+        self._database._prefetch()
         self._database._meta["encoder"] = new_encoder
+        self._database._changes.modify_meta(reencrypt=True)
         self._database._set_state(self._database._modified_state)
 
-    def open(self, master_key: str) -> None:
+    def open(self, master_key: str, workers: int = 1, pool: Pool = Pool.THREAD) -> None:
         ...
 
     def close(self) -> None:
-        self._database._connection.close()
-        self._database._connection = None
-        self._database._cursor = None
+        libconnection.POOL.release(self._database.location())
+        self._database._key = None
+        self._database._index_key = None
+        self._database._search.clear()
+        libitem.clear_caches()
         self._database._set_state(self._database._closed_state)
 
-    def save(self) -> None:
+    def save(self, chunk_size: int = 0) -> None:
         ...
 
     def group(self, name: str) -> "GroupInterface":
-        return self._database._groups[name]
+        return self._database._groups.get(name)
+
+    def groups(self) -> typing.Sequence["GroupInterface"]:
+        return self._database._groups.view()
 
-    def groups(self) -> typing.List["GroupInterface"]:
-        return list(self._database._groups.values())
+    def index_of(self, group: "GroupInterface") -> int:
+        return self._database._groups.index_of(group)
 
     def add_group(self, group: "GroupInterface") -> None:
-        if group.name() in self._database.groups():
-            raise ValueError(f"Group with name {group.name()} already exist")
+        self.add_groups([group])
 
-        group._set_database(self._database)
-        self._database._groups[group.name()] = group
+    def add_groups(self, groups: typing.Iterable["GroupInterface"]) -> None:
+        groups = list(groups)
+        for group in groups:
+            if group.database() is not None:
+                raise ValueError(f"Group with name {group.name()} already belongs to a database")
+
+        self._database._groups.add_many(groups)
+        for group in groups:
+            group._set_database(self._database)
+            self._database._changes.add_group(group)
+            for item in group.items():
+                self._database._search.update(item)
+
+        # listeners see the group events before the status change, so the registry is never ahead of them
+        for group in groups:
+            self._database._notify(Event.GROUP_ADDED, group)
         self._database._set_state(self._database._modified_state)
 
     def remove(self) -> None:
@@ -211,34 +298,137 @@ class _OpenedState(_BaseState):
         os.remove(self._database.location())
 
     def remove_group(self, group: "GroupInterface") -> None:
-        if group.name() not in self._database._groups:
-            raise ValueError(f"Group with name {group.name()} is not exist")
-
-        del self._database._groups[group.name()]
+        self._database._groups.remove(group)
+        self._database._changes.remove_group(group)
+        self._database._search.remove_group(group)
+        self._database._notify(Event.GROUP_REMOVED, group)
         self._database._set_state(self._database._modified_state)
 
+    def search(self, query: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        return self._database._search.search(query, limit)
+
+    def lookup_by_url(self, url: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        self._database._wait_search_index()
+        return self._database._search.lookup(url, limit)
+
+    def find(self, title: str = None, url: str = None, login: str = None) -> typing.List[Match]:
+        wanted = blind_index.terms({"title": title, "url": url, "login": login})
+        if not wanted:
+            return []
+
+        changes = self._database._changes
+        if changes.reencrypt:
+            # stored tokens belong to the previous key, but every item is loaded
+            return [Match(0, group, item, *describe(item.data())) for group in self.groups()
+                    for item in group.items() if wanted <= blind_index.terms(item.data())]
+
+        self._database._build_item_index()
+        key = self._database._derived_index_key()
+        tokens = [blind_index.token(key, term) for term in wanted]
+        rows = self._database._cursor.execute(f"""
+            SELECT id, group_id, data FROM item WHERE id IN (
+                SELECT item_id FROM item_index WHERE token IN ({", ".join("?" * len(tokens))})
+                GROUP BY item_id HAVING count(*) = ?
+            ) ORDER BY id
+        """, tokens + [len(tokens)]).fetchall()
+
+        # items with unsaved changes are matched in memory, rows of removed groups and items are dropped
+        groups = {g._id: g for g in self.groups() if not changes.is_new_group(g)}
+        skipped = changes.removed_items | {item._id for item in changes.modified_items.values()}
+        rows = [r for r in rows if r[1] in groups and r[0] not in skipped]
+        loaded, stored = {}, []
+        for row in rows:
+            group = groups[row[1]]
+            if group._loader is None:
+                if row[1] not in loaded:
+                    loaded[row[1]] = {item._id: item for item in group._items}
+                if row[0] in loaded[row[1]]:
+                    stored.append((group, loaded[row[1]][row[0]], None))
+            else:
+                stored.append((group, row[0], row[2]))
+
+        # only rows of groups that are not loaded are decrypted
+        data = iter(self._database._decrypt_many([d for _, _, d in stored if d is not None]))
+        candidates = [(group, ref, ref.data() if d is None else next(data)) for group, ref, d in stored]
+        unsaved = changes.items_to_insert() + list(changes.modified_items.values())
+        candidates += [(item.group(), item, item.data()) for item in unsaved]
+        # tokens are truncated, so matches are confirmed on the plaintext
+        return [Match(0, group, ref, *describe(d)) for group, ref, d in candidates
+                if wanted <= blind_index.terms(d)]
+
+    def verify(self) -> typing.List[ItemInterface]:
+        # only groups that are already loaded are checked, so no connection is used from the calling thread
+        invalid = []
+        for group in self.groups():
+            if group._loader is None:
+                invalid.extend(item for item in list(group._items) if not item.verify())
+
+        return invalid
+
 
 class _ModifiedState(_OpenedState):
 
     def status(self) -> Status:
         return Status.MODIFIED
 
-    def save(self) -> None:
-        self._save_meta()
-        encrypt = self._encrypt_func()
-        for group in self._database.groups():
-            self._save_group(group)
-            for item in group.items():
-                self._save_item(encrypt, item)
+    def save(self, chunk_size: int = 0) -> None:
+        changes = self._database._changes
+        if changes.reencrypt:
+            # rows of a partly committed reencryption are readable by neither key, so it is written at once
+            chunk_size = 0
+
+        # groups and items given ids since the last commit, the ids are taken back if the save fails
+        self._assigned = []
+        try:
+            if changes.meta:
+                self._save_meta()
+            if changes.reencrypt:
+                self._reset_item_index()
+
+            self._remove_groups(changes.removed_groups)
+            self._rename_groups(changes.renamed_groups.values())
+            self._remove_items(changes.removed_items)
+            self._save_groups(list(changes.new_groups.values()))
+
+            inserted = changes.items_to_insert()
+            updated = changes.items_to_update(self._database.groups())
+            step = chunk_size or max(len(inserted), len(updated), 1)
+            next_id = self._next_id("item")
+            for i in range(0, len(inserted), step):
+                next_id = self._insert_items(inserted[i:i + step], next_id)
+                if chunk_size:
+                    self._commit(inserted[i:i + step])
+
+            for i in range(0, len(updated), step):
+                self._update_items(updated[i:i + step])
+                if chunk_size:
+                    self._commit(updated[i:i + step])
+
+            self._commit([])
+        except:
+            self._database._connection.rollback()
+            for obj in self._assigned:
+                obj._id = libitem.NO_ID
+            raise
+
+        changes.clear()
+        self._database._set_state(self._database._opened_state)
 
+    def _commit(self, items: typing.Sequence[ItemInterface]) -> None:
+        ''' commits the written part of a save and drops it from the changes, so a retry writes only the rest '''
         self._database._connection.commit()
-        self._database._set_state(self._database._opened_state)
+        groups = [obj for obj in self._assigned if isinstance(obj, GroupInterface)]
+        self._database._changes.saved(groups, items)
+        for obj in self._assigned:
+            if isinstance(obj, ItemInterface):
+                self._database._search.rekey(obj)
+
+        self._assigned = []
 
     def _save_meta(self) -> None:
-        self._database._cursor.execute("DELETE FROM meta") # clear previos meta data
         self._database._cursor.execute("""
-            INSERT INTO meta(name, master_key_hash, hash_salt, cipher_salt, hasher_id, cipher_id, encoder_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            UPDATE meta
+            SET name = ?, master_key_hash = ?, hash_salt = ?, cipher_salt = ?, hasher_id = ?, cipher_id = ?, encoder_id = ?
         """, [
             self._database._meta["name"],
             self._hash_master_key(),
@@ -255,48 +445,110 @@ class _ModifiedState(_OpenedState):
         hs = self._database._meta["hash_salt"]
         return e.encode(h.hash(self._database._master_key.encode(), hs))
 
-    def _encrypt_func(self) -> typing.Callable[[str], bytes]:
-        c = self._database._meta["cipher"]
+    def _encrypt_many(self, data: typing.Sequence[str]) -> typing.List[bytes]:
+        k = self._database._derived_key()
         e = self._database._meta["encoder"]
-        cs = self._database._meta["cipher_salt"]
-        def encrypt(data: str) -> str:
-            encrypted = c.encrypt(data.encode(), self._database._master_key.encode(), cs)
-            encoded = e.encode(encrypted)
-            return encoded
-
-        return encrypt
+        return e.encode_many(k.encrypt_many([d.encode() for d in data]))
+
+    def _save_groups(self, groups: typing.Sequence[GroupInterface]) -> None:
+        first_id = self._next_id("group")
+        ids = range(first_id, first_id + len(groups))
+        self._database._cursor.executemany("""
+            INSERT INTO `group`(id, name, type)
+            VALUES (?, ?, ?)
+        """, [(id_, group.name(), group.type().value) for id_, group in zip(ids, groups)])
+        for id_, group in zip(ids, groups):
+            group._id = libitem.NO_ID
+            group._set_id(id_)
+            self._assigned.append(group)
+
+    def _rename_groups(self, groups: typing.Iterable[GroupInterface]) -> None:
+        # names are unique, so renamed rows move to placeholders first and swaps like A -> B, B -> A pass
+        groups = list(groups)
+        self._database._cursor.executemany("""
+            UPDATE `group`
+            SET name = char(0) || id
+            WHERE id = ?
+        """, [(group._id,) for group in groups])
+        self._database._cursor.executemany("""
+            UPDATE `group`
+            SET name = ?
+            WHERE id = ?
+        """, [(group.name(), group._id) for group in groups])
+
+    def _remove_groups(self, ids: typing.Iterable[int]) -> None:
+        self._database._cursor.executemany("""
+            DELETE FROM `group`
+            WHERE id = ?
+        """, [(id_,) for id_ in ids])
+
+    def _next_id(self, table: str) -> int:
+        res = self._database._cursor.execute(f"""
+            SELECT max(coalesce((SELECT seq FROM sqlite_sequence WHERE name = '{table}'), 0), coalesce(max(id), 0))
+            FROM `{table}`
+        """).fetchone()
+        return res[0] + 1
+
+    def _insert_items(self, items: typing.Sequence[ItemInterface], first_id: int) -> int:
+        data = self._encrypt_many([json.dumps(item.data()) for item in items])
+        ids = range(first_id, first_id + len(items))
+        self._database._cursor.executemany("""
+            INSERT INTO item(id, group_id, data)
+            VALUES (?, ?, ?)
+        """, [(id_, item.group()._id, d) for id_, item, d in zip(ids, items, data)])
+        for id_, item in zip(ids, items):
+            item._id = libitem.NO_ID
+            item._set_id(id_)
+            self._assigned.append(item)
+
+        self._index_items(items)
+        return first_id + len(items)
+
+    def _update_items(self, items: typing.Sequence[ItemInterface]) -> None:
+        data = self._encrypt_many([json.dumps(item.data()) for item in items])
+        self._database._cursor.executemany("""
+            UPDATE item
+            SET data = ?
+            WHERE id = ?
+        """, [(d, item._id) for item, d in zip(items, data)])
+        self._database._cursor.executemany("""
+            DELETE FROM item_index
+            WHERE item_id = ?
+        """, [(item._id,) for item in items])
+        self._index_items(items)
+
+    def _index_items(self, items: typing.Sequence[ItemInterface]) -> None:
+        key = self._database._derived_index_key()
+        self._database._cursor.executemany("""
+            INSERT INTO item_index(token, item_id)
+            VALUES (?, ?)
+        """, [(token, item._id) for item in items for token in blind_index.tokens(key, item.data())])
 
-    def _save_group(self, group: GroupInterface) -> None:
+    def _reset_item_index(self) -> None:
+        ''' drops tokens of the previous key, the save writes every item again '''
+        self._database._cursor.execute("DELETE FROM item_index")
         self._database._cursor.execute("""
-            INSERT OR IGNORE INTO `group`
-            VALUES (?, ?)
-        """, [group.name(), group.type().value])
+            UPDATE meta
+            SET index_check = ?
+        """, [blind_index.check(self._database._derived_index_key())])
 
-    def _save_item(self, encrypt_func: typing.Callable[[str], bytes], item: ItemInterface) -> None:
-        data = encrypt_func(json.dumps(item.data()))
-        if item._id == libitem.NO_ID:
-            res = self._database._cursor.execute("""
-                INSERT INTO item(group_name, data)
-                VALUES (?, ?)
-            """, [item.group().name(), data])
-            item._set_id(res.lastrowid)
-        else:
-            self._database._cursor.execute("""
-                UPDATE item
-                SET data = ?
-                WHERE id = ?
-            """, [data, item._id])
+    def _remove_items(self, ids: typing.Iterable[int]) -> None:
+        self._database._cursor.executemany("""
+            DELETE FROM item
+            WHERE id = ?
+        """, [(id_,) for id_ in ids])
 
 
 class SQLiteDatabase(DatabaseInterface):
 
     @staticmethod
     def create(location: str, name: str, master_key: str, hasher: libhasher.HashInterface,
-            cipher: libcipher.CipherInterface, encoder: libencoder.EncoderInterface) -> "SQLiteDatabase":
+            cipher: libcipher.CipherInterface, encoder: libencoder.EncoderInterface,
+            profile: libprofile.Profile = libprofile.DEFAULT_PROFILE) -> "SQLiteDatabase":
         hash_salt = generate.random_bytes(SALT_LENGTH)
         cipher_salt = generate.random_bytes(SALT_LENGTH)
         master_key_hash = encoder.encode(hasher.hash(master_key.encode(), hash_salt))
-        con = sqlite3.connect(location)
+        con = libconnection.connect(location, profile)
         cur = con.cursor()
         cur.execute("""
             CREATE TABLE IF NOT EXISTS meta (
@@ -329,28 +581,45 @@ class SQLiteDatabase(DatabaseInterface):
             VALUES (?, ?, ?, ?, ?, ?, ?);
         """, [name, master_key_hash, hash_salt, cipher_salt, libcipher.ID(cipher.id()).value, libhasher.ID(hasher.id()).value, libencoder.ID(encoder.id()).value])
         con.commit()
+        migrations.upgrade(con)
+        # the index of an empty database is complete
+        con.execute("UPDATE meta SET index_check = ?", [blind_index.check(blind_index.derive(master_key.encode(), cipher_salt))])
+        con.commit()
         con.close()
-        db = SQLiteDatabase(location)
+        db = SQLiteDatabase(location, profile)
         db.open(master_key)
         return db
 
-    def __init__(self, location: str):
-        if not os.path.isfile(location):
-            raise ValueError(f"Invalid database location: {location}")
-
+    def __init__(self, location: str, profile: libprofile.Profile = libprofile.DEFAULT_PROFILE,
+            meta: typing.Dict[str, typing.Any] = None):
         super().__init__()
         self._location = location
-        self._connection = sqlite3.connect(self._location)
-        self._cursor = self._connection.cursor()
+        self._profile = profile
         self._master_key = None
-        self._groups = {}
+        self._key = None
+        self._index_key = None
+        self._workers = 1
+        self._pool = Pool.THREAD
+        self._groups = GroupRegistry()
+        self._listeners = []
+        self._changes = ChangeSet()
+        self._search = SearchIndex()
+        self._indexer = None
         
         self._closed_state = _ClosedState(self)
         self._opened_state = _OpenedState(self)
         self._modified_state = _ModifiedState(self)
         self._current_state = self._closed_state
         
-        self._load_meta()
+        if meta is None:
+            self._load_meta()
+        else:
+            self._meta = {
+                "name": meta["name"],
+                "hasher": libhasher.from_id(meta["hasher"]),
+                "cipher": libcipher.from_id(meta["cipher"]),
+                "encoder": libencoder.from_id(meta["encoder"]),
+            }
 
     def location(self) -> str:
         return self._location
@@ -373,41 +642,198 @@ class SQLiteDatabase(DatabaseInterface):
     def encoder(self, new_encoder: libencoder.EncoderInterface = None) -> libencoder.EncoderInterface | None:
         return self._current_state.encoder(new_encoder)
 
-    def open(self, master_key: str) -> None:
-        self._current_state.open(master_key)
+    def open(self, master_key: str, workers: int = 1, pool: Pool = Pool.THREAD) -> None:
+        self._current_state.open(master_key, workers, pool)
 
     def close(self) -> None:
         self._current_state.close()
 
-    def save(self) -> None:
-        self._current_state.save()
+    def save(self, chunk_size: int = 0) -> None:
+        self._current_state.save(chunk_size)
 
     def group(self, name: str) -> "GroupInterface":
         return self._current_state.group(name)
 
-    def groups(self) -> typing.List["GroupInterface"]:
+    def groups(self) -> typing.Sequence["GroupInterface"]:
         return self._current_state.groups()
 
+    def index_of(self, group: "GroupInterface") -> int:
+        return self._current_state.index_of(group)
+
     def add_group(self, group: "GroupInterface") -> None:
         self._current_state.add_group(group)
 
+    def add_groups(self, groups: typing.Iterable["GroupInterface"]) -> None:
+        self._current_state.add_groups(groups)
+
     def remove(self) -> None:
         self._current_state.remove()
 
     def remove_group(self, group: "GroupInterface") -> None:
         self._current_state.remove_group(group)
 
+    def verify(self) -> typing.List[ItemInterface]:
+        ''' items loaded without validation that fail it now '''
+        return self._current_state.verify()
+
+    def search(self, query: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        ''' best matches of all query terms, items that are still being indexed may be missing '''
+        return self._current_state.search(query, limit)
+
+    def find(self, title: str = None, url: str = None, login: str = None) -> typing.List[Match]:
+        ''' items whose title has all given words and whose url host and login are equal to the given ones,
+        only the stored rows they match are decrypted '''
+        return self._current_state.find(title, url, login)
+
+    def lookup_by_url(self, url: str, limit: int = RESULT_LIMIT) -> typing.List[Match]:
+        ''' items saved for the host of `url`, its parent domains or other hosts of its site, closest first,
+        waits for the search index of a database that was just opened '''
+        return self._current_state.lookup_by_url(url, limit)
+
     def _set_state(self, state: DatabaseInterface) -> None:
         if self._current_state == self._closed_state and state == self._modified_state:
             raise ValueError("Unsupported storage transtion from closed to modified state")
+        elif state == self._current_state:
+            return
 
         self._current_state = state
+        self._notify(Event.STATUS_CHANGED)
+
+    def listen(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def unlisten(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, event: Event, group: GroupInterface = None) -> None:
+        for listener in list(self._listeners):
+            listener(self, event, group)
+
+    def profile(self, new_profile: libprofile.Profile = None) -> libprofile.Profile | None:
+        if new_profile is None:
+            return self._profile
+
+        self._profile = new_profile
+        connection = libconnection.POOL.get(self._location)
+        if connection is not None:
+            libprofile.apply(connection, new_profile)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        return libconnection.POOL.acquire(self._location, self._profile)
+
+    @property
+    def _cursor(self) -> sqlite3.Cursor:
+        return self._connection.cursor()
+
+    def _build_search_index(self) -> None:
+        ''' indexes stored rows in a background thread, items with unsaved changes are indexed from memory '''
+        generation = self._search.begin()
+        changes = self._changes
+        if changes.reencrypt:
+            # stored rows are still encrypted with the previous key, but every item is loaded
+            groups, skipped = {}, set()
+            items = [item for group in self._groups.view() for item in group.items()]
+        else:
+            groups = {g._id: g for g in self._groups.view() if not changes.is_new_group(g)}
+            skipped = changes.removed_items | {item._id for item in changes.modified_items.values()}
+            items = [item for g in changes.new_groups.values() for item in g.items()]
+            items += list(changes.new_items.values()) + list(changes.modified_items.values())
 
-    def _load_meta(self) -> None:
+        self._indexer = threading.Thread(target=_index_rows, daemon=True, args=(
+            self._search, generation, self._location, self._derived_key(), self._meta["encoder"], groups, skipped, items))
+        self._indexer.start()
+
+    def _wait_search_index(self) -> None:
+        if not self._search.ready() and self._indexer is not None:
+            self._indexer.join()
+
+    def _prefetch(self) -> None:
+        for group in self._groups.view():
+            group.prefetch()
+
+    def _load_items(self, group: GroupInterface, offset: int = 0, limit: int = None) -> typing.List[ItemInterface]:
+        if self.status() == Status.CLOSED:
+            raise ClosedError("database closed")
+
+        # pages continue after the last loaded id, so the index is used instead of skipping `offset` rows
+        after = group._items[offset - 1]._id if offset else 0
         res = self._cursor.execute("""
-            SELECT name, master_key_hash, hash_salt, cipher_salt, hasher_id, cipher_id, encoder_id
-            FROM meta
-        """).fetchone()
+            SELECT id, data FROM item WHERE group_id = ? AND id > ? ORDER BY id LIMIT ?
+        """, [group._id, after, -1 if limit is None else limit]).fetchall()
+        item_type = factory.item_from_type(group.type())
+        items = []
+        for r, data in zip(res, self._decrypt_many([r[1] for r in res])):
+            item = item_type.trusted(data)
+            item._set_id(r[0])
+            items.append(item)
+
+        return items
+
+    def _decrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[typing.Dict[str, str]]:
+        k = self._derived_key()
+        e = self._meta["encoder"]
+        if self._workers <= 1 or len(data) <= DECRYPT_CHUNK_SIZE:
+            return _decrypt_chunk(k, e, data)
+
+        chunks = [data[i:i + DECRYPT_CHUNK_SIZE] for i in range(0, len(data), DECRYPT_CHUNK_SIZE)]
+        executor = ProcessPoolExecutor if self._pool == Pool.PROCESS else ThreadPoolExecutor
+        with executor(max_workers=self._workers) as ex:
+            res = []
+            for chunk in ex.map(_decrypt_chunk, [k] * len(chunks), [e] * len(chunks), chunks):
+                res.extend(chunk)
+
+        return res
+
+    def _derived_key(self) -> libcipher.KeyInterface:
+        if self._key is None:
+            self._key = self._meta["cipher"].derive(self._master_key.encode(), self._meta["cipher_salt"])
+
+        return self._key
+
+    def _derived_index_key(self) -> bytes:
+        if self._index_key is None:
+            self._index_key = blind_index.derive(self._master_key.encode(), self._meta["cipher_salt"] or b"")
+
+        return self._index_key
+
+    def _build_item_index(self) -> None:
+        ''' writes the tokens of all stored rows once, when they are missing or belong to another key '''
+        key = self._derived_index_key()
+        check = blind_index.check(key)
+        cursor = self._cursor
+        if cursor.execute("SELECT index_check FROM meta").fetchone()[0] == check:
+            return
+
+        cursor.execute("DELETE FROM item_index")
+        after = 0
+        while True:
+            rows = cursor.execute("""
+                SELECT id, data FROM item WHERE id > ? ORDER BY id LIMIT ?
+            """, [after, DECRYPT_CHUNK_SIZE]).fetchall()
+            if not rows:
+                break
+
+            after = rows[-1][0]
+            cursor.executemany("""
+                INSERT INTO item_index(token, item_id)
+                VALUES (?, ?)
+            """, [(token, r[0]) for r, d in zip(rows, self._decrypt_many([r[1] for r in rows]))
+                  for token in blind_index.tokens(key, d)])
+
+        cursor.execute("UPDATE meta SET index_check = ?", [check])
+        self._connection.commit()
+
+    def _load_meta(self) -> None:
+        if not os.path.isfile(self._location):
+            raise ValueError(f"Invalid database location: {self._location}")
+
+        with libconnection.read_only(self._location) as con:
+            res = con.execute("""
+                SELECT name, master_key_hash, hash_salt, cipher_salt, hasher_id, cipher_id, encoder_id
+                FROM meta
+            """).fetchone()
+
         self._meta = {
             "name": res[0],
             "master_key_hash": res[1],
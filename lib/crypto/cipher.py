@@ -1,4 +1,4 @@
-
+import typing
 from enum import Enum
 
 from Crypto.Protocol.KDF import PBKDF2
@@ -13,6 +13,22 @@ class ID(Enum):
     AES_CBC = "AES-CBC"
 
 
+class KeyInterface:
+    ''' key derived from master key and salt, ready for repeated use '''
+
+    def encrypt(self, data: bytes) -> bytes:
+        raise NotImplementedError("KeyInterface.encrypt is not implemented")
+
+    def decrypt(self, data: bytes) -> bytes:
+        raise NotImplementedError("KeyInterface.decrypt is not implemented")
+
+    def encrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        raise NotImplementedError("KeyInterface.encrypt_many is not implemented")
+
+    def decrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        raise NotImplementedError("KeyInterface.decrypt_many is not implemented")
+
+
 class CipherInterface:
 
     @staticmethod
@@ -23,6 +39,18 @@ class CipherInterface:
     def decrypt(data: bytes, key: bytes, salt: bytes) -> bytes:
         raise NotImpelementedErr("CipherInterface.decrypt is not implemented")
 
+    @staticmethod
+    def encrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes) -> typing.List[bytes]:
+        raise NotImplementedError("CipherInterface.encrypt_many is not implemented")
+
+    @staticmethod
+    def decrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes) -> typing.List[bytes]:
+        raise NotImplementedError("CipherInterface.decrypt_many is not implemented")
+
+    @staticmethod
+    def derive(key: bytes, salt: bytes) -> KeyInterface:
+        raise NotImplementedError("CipherInterface.derive is not implemented")
+
     @staticmethod
     def id() -> ID:
         raise NotImpelementedErr("CipherInterface.id is not implemented")
@@ -36,19 +64,90 @@ def from_id(id_: str) -> CipherInterface:
             return None
 
 
+class _AESKey(KeyInterface):
+
+    def __init__(self, key: bytes, mode):
+        self._key = key
+        self._mode = mode
+
+    def encrypt(self, data: bytes) -> bytes:
+        iv = random_bytes(AES.block_size)
+        cipher = AES.new(self._key, self._mode, iv)
+        return iv + cipher.encrypt(pad(data, AES.block_size))
+
+    def decrypt(self, data: bytes) -> bytes:
+        cipher = AES.new(self._key, self._mode, data[:AES.block_size])
+        return unpad(cipher.decrypt(data[AES.block_size:]), AES.block_size)
+
+    def encrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        bs = AES.block_size
+        ivs = random_bytes(bs * len(data))
+        res = []
+        for i, d in enumerate(data):
+            iv = ivs[i * bs:(i + 1) * bs]
+            res.append(iv + AES.new(self._key, self._mode, iv).encrypt(pad(d, bs)))
+
+        return res
+
+    def decrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        return [self.decrypt(d) for d in data]
+
+
+class _AESCBCKey(_AESKey):
+    ''' decrypts a batch with a single ECB pass over all buffers '''
+
+    def __init__(self, key: bytes):
+        super().__init__(key, AES.MODE_CBC)
+
+    def decrypt_many(self, data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        bs = AES.block_size
+        if not data:
+            return []
+
+        for d in data:
+            if len(d) < 2 * bs or len(d) % bs:
+                raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+
+        # P[i] = D(C[i]) ^ C[i-1], IV of every buffer acts as its C[-1]
+        stream = b"".join(data)
+        size = len(stream)
+        plain = bytearray(size)
+        AES.new(self._key, AES.MODE_ECB).decrypt(stream, output=plain)
+        plain = (int.from_bytes(plain, "big") ^ int.from_bytes(stream[:size - bs], "big")).to_bytes(size, "big")
+        res = []
+        offset = 0
+        for d in data:
+            res.append(unpad(plain[offset + bs:offset + len(d)], bs))
+            offset += len(d)
+
+        return res
+
+
 class _AES(CipherInterface):
     ''' base aes implementation '''
 
     @staticmethod
     def encrypt(data: bytes, key: bytes, salt: bytes, mode) -> bytes:
-        iv = random_bytes(AES.block_size)
-        cipher = AES.new(_AES._pbkdf2(key, salt), mode, iv)
-        return iv + cipher.encrypt(pad(data, AES.block_size))   
+        return _AES.derive(key, salt, mode).encrypt(data)
     
     @staticmethod
     def decrypt(data: bytes, key: bytes, salt: bytes, mode) -> bytes:
-        cipher = AES.new(_AES._pbkdf2(key, salt), mode, data[:AES.block_size])
-        return unpad(cipher.decrypt(data[AES.block_size:]), AES.block_size)
+        return _AES.derive(key, salt, mode).decrypt(data)
+
+    @staticmethod
+    def encrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes, mode) -> typing.List[bytes]:
+        return _AES.derive(key, salt, mode).encrypt_many(data)
+
+    @staticmethod
+    def decrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes, mode) -> typing.List[bytes]:
+        return _AES.derive(key, salt, mode).decrypt_many(data)
+
+    @staticmethod
+    def derive(key: bytes, salt: bytes, mode) -> KeyInterface:
+        if mode == AES.MODE_CBC:
+            return _AESCBCKey(_AES._pbkdf2(key, salt))
+
+        return _AESKey(_AES._pbkdf2(key, salt), mode)
 
     @staticmethod
     def _pbkdf2(key: bytes, salt: bytes) -> bytes:
@@ -65,5 +164,17 @@ class AES_CBC(_AES):
     def decrypt(data: bytes, key: bytes, salt: bytes) -> bytes:
         return _AES.decrypt(data, key, salt, AES.MODE_CBC)
 
+    @staticmethod
+    def encrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes) -> typing.List[bytes]:
+        return _AES.encrypt_many(data, key, salt, AES.MODE_CBC)
+
+    @staticmethod
+    def decrypt_many(data: typing.Sequence[bytes], key: bytes, salt: bytes) -> typing.List[bytes]:
+        return _AES.decrypt_many(data, key, salt, AES.MODE_CBC)
+
+    @staticmethod
+    def derive(key: bytes, salt: bytes) -> KeyInterface:
+        return _AES.derive(key, salt, AES.MODE_CBC)
+
     def id() -> ID:
         return ID.AES_CBC
@@ -1,5 +1,7 @@
 
 import base64
+import binascii
+import typing
 from enum import Enum
 
 
@@ -18,6 +20,14 @@ class EncoderInterface:
     def decode(data: bytes) -> bytes:
         raise NotImpelementedErr("EncodeInterface.decode is not implemented")
 
+    @staticmethod
+    def encode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        raise NotImplementedError("EncodeInterface.encode_many is not implemented")
+
+    @staticmethod
+    def decode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        raise NotImplementedError("EncodeInterface.decode_many is not implemented")
+
     @staticmethod
     def id() -> str:
         raise NotImpelementedErr("EncodeInterface.id is not implemented")
@@ -42,6 +52,16 @@ class Base32(EncoderInterface):
     def decode(data: bytes) -> bytes:
         return base64.b32decode(data)
 
+    @staticmethod
+    def encode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        encode = base64.b32encode
+        return [encode(d) for d in data]
+
+    @staticmethod
+    def decode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        decode = base64.b32decode
+        return [decode(d) for d in data]
+
     @staticmethod
     def id() -> ID:
         return ID.BASE32
@@ -57,6 +77,16 @@ class Base64(EncoderInterface):
     def decode(data: bytes) -> bytes:
         return base64.b64decode(data)
 
+    @staticmethod
+    def encode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        encode = binascii.b2a_base64
+        return [encode(d, newline=False) for d in data]
+
+    @staticmethod
+    def decode_many(data: typing.Sequence[bytes]) -> typing.List[bytes]:
+        decode = binascii.a2b_base64
+        return [decode(d) for d in data]
+
     @staticmethod
     def id() -> ID:
         return ID.BASE64
@@ -22,6 +22,31 @@ class TestAES_CBC(unittest.TestCase):
             decrypted = self.cipher.decrypt(encrypted, key, salt)
             self.assertEqual(decrypted, t["data"].encode())
 
+    def test_derived_key(self) -> None:
+        for t in self.test_tbl:
+            key, salt = t["key"].encode(), t["salt"].encode()
+            derived = self.cipher.derive(key, salt)
+            encrypted = derived.encrypt(t["data"].encode())
+            self.assertEqual(derived.decrypt(encrypted), t["data"].encode())
+            self.assertEqual(self.cipher.decrypt(encrypted, key, salt), t["data"].encode())
+            self.assertEqual(derived.decrypt(self.cipher.encrypt(t["data"].encode(), key, salt)), t["data"].encode())
+
+    def test_cipher_many_cycle(self) -> None:
+        for t in self.test_tbl:
+            key, salt = t["key"].encode(), t["salt"].encode()
+            data = [t["data"].encode() * i for i in range(40)]
+            encrypted = self.cipher.encrypt_many(data, key, salt)
+            self.assertEqual(len(encrypted), len(data))
+            self.assertEqual(self.cipher.decrypt_many(encrypted, key, salt), data)
+            self.assertEqual([self.cipher.decrypt(e, key, salt) for e in encrypted], data)
+            self.assertEqual(self.cipher.decrypt_many([], key, salt), [])
+
+    def test_decrypt_many_invalid(self) -> None:
+        for t in self.test_tbl:
+            key, salt = t["key"].encode(), t["salt"].encode()
+            encrypted = self.cipher.encrypt(t["data"].encode(), key, salt)
+            self.assertRaises(ValueError, lambda: self.cipher.decrypt_many([encrypted[:-1]], key, salt))
+
 
 if __name__ == "__main__":
     unittest.main()
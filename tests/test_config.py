@@ -1,8 +1,18 @@
 
+import os
+import shutil
 import unittest
+import tempfile
+from unittest import mock
 import yaml
 
-from lib.core.config import Config
+from lib.core.config import Config, Change
+from lib.core.sqlite_database import SQLiteDatabase
+
+from lib.crypto import hasher
+from lib.crypto import cipher
+from lib.crypto import encoder
+from lib.crypto import generate
 
 
 class TestConfig(unittest.TestCase):
@@ -12,5 +22,59 @@ class TestConfig(unittest.TestCase):
         self.assertIs(Config(), Config())
 
 
+class TestConfigChanges(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.patch = mock.patch("appdirs.user_config_dir", return_value=self.dir)
+        self.patch.start()
+        self.instance = Config._instance
+        Config._instance = None
+        self.location = os.path.join(self.dir, generate.string(10))
+        SQLiteDatabase.create(self.location, "Personal", "master-key",
+            hasher.SHA256, cipher.AES_CBC, encoder.Base64).close()
+
+    def tearDown(self) -> None:
+        Config._instance = self.instance
+        self.patch.stop()
+        shutil.rmtree(self.dir)
+
+    def test_init_once(self) -> None:
+        config = Config()
+        with mock.patch.object(Config, "_read") as read:
+            Config()
+            config.databases()
+            read.assert_not_called()
+
+    def test_add_remove(self) -> None:
+        config = Config()
+        changes = []
+        config.listen(lambda change, db: changes.append((change, db)))
+        db = SQLiteDatabase(self.location)
+        config.add_database(db)
+        with open(os.path.join(self.dir, "config.yaml")) as yaml_file:
+            self.assertEqual(yaml.safe_load(yaml_file)["databases"], [self.location])
+
+        config.remove_database(db)
+        with open(os.path.join(self.dir, "config.yaml")) as yaml_file:
+            self.assertEqual(yaml.safe_load(yaml_file)["databases"], [])
+
+        self.assertEqual(changes, [(Change.ADDED, db), (Change.REMOVED, db)])
+
+    def test_deleted(self) -> None:
+        Config().add_database(SQLiteDatabase(self.location))
+        os.remove(self.location)
+        Config._instance = None
+        self.assertEqual(Config().databases(), [])
+
+    def test_reload(self) -> None:
+        config = Config()
+        db = SQLiteDatabase(self.location)
+        config.add_database(db)
+        config.reload()
+        self.assertEqual(len(config.databases()), 1)
+        self.assertIs(config.databases()[0], db)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import unittest
+import tempfile
+
+from lib.core.connection import ConnectionPool, read_only
+from lib.core.profile import Profile
+from lib.crypto import generate
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.locations = [os.path.join(tempfile.gettempdir(), generate.string(10)) for _ in range(3)]
+
+    def tearDown(self) -> None:
+        for loc in self.locations:
+            if os.path.exists(loc):
+                os.remove(loc)
+
+    def test_acquire(self) -> None:
+        pool = ConnectionPool(limit=2)
+        con = pool.acquire(self.locations[0], Profile.DURABLE)
+        self.assertIs(pool.acquire(self.locations[0], Profile.DURABLE), con)
+        self.assertIs(pool.get(self.locations[0]), con)
+        self.assertIsNone(pool.get(self.locations[1]))
+        self.assertEqual(con.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+
+    def test_limit(self) -> None:
+        pool = ConnectionPool(limit=2)
+        for loc in self.locations:
+            pool.acquire(loc, Profile.DURABLE)
+
+        self.assertEqual(pool.size(), 2)
+        self.assertIsNone(pool.get(self.locations[0]))
+        self.assertIsNotNone(pool.get(self.locations[2]))
+
+    def test_limit_in_transaction(self) -> None:
+        pool = ConnectionPool(limit=1)
+        con = pool.acquire(self.locations[0], Profile.DURABLE)
+        con.execute("CREATE TABLE t (x)")
+        con.execute("INSERT INTO t VALUES (1)")
+        pool.acquire(self.locations[1], Profile.DURABLE)
+        self.assertIs(pool.get(self.locations[0]), con)
+        con.commit()
+        pool.acquire(self.locations[1], Profile.DURABLE)
+        self.assertIsNone(pool.get(self.locations[0]))
+
+    def test_release_idle(self) -> None:
+        pool = ConnectionPool(idle_timeout=0)
+        con = pool.acquire(self.locations[0], Profile.DURABLE)
+        pool.release_idle()
+        self.assertIsNone(pool.get(self.locations[0]))
+        self.assertRaises(sqlite3.ProgrammingError, lambda: con.execute("SELECT 1"))
+
+    def test_read_only(self) -> None:
+        with sqlite3.connect(self.locations[0]) as con:
+            con.execute("CREATE TABLE t (x)")
+
+        con.close()
+        with read_only(self.locations[0]) as con:
+            self.assertEqual(con.execute("SELECT count(*) FROM t").fetchone()[0], 0)
+            self.assertRaises(sqlite3.OperationalError, lambda: con.execute("INSERT INTO t VALUES (1)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
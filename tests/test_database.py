@@ -1,10 +1,17 @@
 
 import os
+import sqlite3
 import typing
 import unittest
 import tempfile
+from unittest import mock
 
-from lib.core.database import Status
+import lib.core.sqlite_database as sqlite_database
+import lib.core.search as search
+from lib.core.database import Status, Pool, Event, ClosedError
+from lib.core import migrations
+from lib.core.profile import Profile
+from lib.core.connection import POOL
 from lib.core.sqlite_database import SQLiteDatabase
 from lib.core.data.item import PasswordItem
 from lib.core.data.group import PasswordsGroup
@@ -51,8 +58,21 @@ class TestSQLite(unittest.TestCase):
     def test_close(self) -> None:
         for t in self.test_tbl:
             db = self.__create_temp_db(t)
+            PasswordItem({"url": "https://site.com", "login": "login", "password": "password"})
             db.close()
             self.assertEqual(db.status(), Status.CLOSED)
+            self.assertEqual(PasswordItem._SCHEMA["url"].cache_info().currsize, 0)
+
+    def test_connection(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            self.assertIsNotNone(POOL.get(location))
+            db.close()
+            self.assertIsNone(POOL.get(location))
+            db = SQLiteDatabase(location)
+            self.assertEqual(db.name(), t["name"])
+            self.assertIsNone(POOL.get(location))
 
     def test_open(self) -> None:
         for t in self.test_tbl:
@@ -62,6 +82,20 @@ class TestSQLite(unittest.TestCase):
             self.assertEqual(db.status(), Status.OPENED)
             db.close()
 
+    def test_open_upgrade(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            db._connection.execute(f"PRAGMA user_version = {migrations.VERSION + 1}")
+            db.close()
+
+            db = SQLiteDatabase(location)
+            self.assertRaises(ValueError, lambda: db.open("wrong-key"))
+            self.assertIsNone(POOL.get(location))
+            self.assertRaises(migrations.MigrationError, lambda: db.open(t["master_key"]))
+            self.assertIsNone(POOL.get(location))
+            self.assertEqual(db.status(), Status.CLOSED)
+
     def test_save(self) -> None:
         for t in self.test_tbl:
             db = self.__create_temp_db(t)
@@ -82,6 +116,350 @@ class TestSQLite(unittest.TestCase):
             self.assertEqual(group.item(0), password)
             self.assertEqual(len(group.items()), 1)
             self.assertEqual(password._id, 1)
+            self.assertEqual(group._id, 1)
+
+    def test_save_many(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password" * i or "password",
+            }) for i in range(50)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            loaded = db.group("Passwords").items()
+            self.assertEqual([i.data() for i in loaded], [i.data() for i in items])
+            self.assertEqual([i._id for i in loaded], [i._id for i in items])
+            db.close()
+
+    def test_open_parallel(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(40)]
+            db.add_group(PasswordsGroup(name="First", items=items[:25]))
+            db.add_group(PasswordsGroup(name="Second", items=items[25:]))
+            db.save()
+            db.close()
+
+            for pool in Pool:
+                with mock.patch.object(sqlite_database, "DECRYPT_CHUNK_SIZE", 8):
+                    db = SQLiteDatabase(location)
+                    db.open(t["master_key"], workers=3, pool=pool)
+
+                loaded = db.group("First").items() + db.group("Second").items()
+                self.assertEqual([i.data() for i in loaded], [i.data() for i in items])
+                self.assertEqual([i._id for i in loaded], [i._id for i in items])
+                db.close()
+
+    def test_save_incremental(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(10)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            db.add_group(PasswordsGroup(name="Removed", items=[]))
+            db.save()
+
+            statements = []
+            db._connection.set_trace_callback(statements.append)
+            items[3].entry("login", "changed")
+            db.save()
+            writes = [st for st in statements if st.lstrip().split()[0] in ("INSERT", "UPDATE", "DELETE")]
+            # tokens of the item are replaced: one delete and an insert per host and login
+            self.assertEqual(len([st for st in writes if "item_index" in st]), 3)
+            writes = [st for st in writes if "item_index" not in st]
+            self.assertEqual(len(writes), 1)
+            self.assertIn("UPDATE item", writes[0])
+
+            statements.clear()
+            db.name("Renamed")
+            db.save()
+            writes = [st for st in statements if st.lstrip().split()[0] in ("INSERT", "UPDATE", "DELETE")]
+            self.assertEqual(len(writes), 1)
+            self.assertIn("UPDATE meta", writes[0])
+
+            db.group("Passwords").remove_item(items[0])
+            db.group("Passwords").name("Logins")
+            db.group("Removed").remove()
+            db.save()
+            db._connection.set_trace_callback(None)
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual(db.name(), "Renamed")
+            self.assertEqual([g.name() for g in db.groups()], ["Logins"])
+            loaded = db.group("Logins").items()
+            self.assertEqual([i._id for i in loaded], [i._id for i in items[1:]])
+            self.assertEqual(loaded[2].entry("login"), "changed")
+            db.close()
+
+    def test_save_chunked(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            first = PasswordItem({"url": "https://first.com", "login": "login", "password": "password"})
+            db.add_group(PasswordsGroup(name="Passwords", items=[first]))
+            db.save()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(20)]
+            for item in items:
+                db.group("Passwords").add_item(item)
+
+            db.save(chunk_size=6)
+            self.assertEqual([i._id for i in items], list(range(first._id + 1, first._id + 21)))
+            for item in items:
+                item.entry("login", "changed")
+
+            db.save(chunk_size=6)
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            loaded = db.group("Passwords").items()
+            self.assertEqual([i._id for i in loaded], [first._id] + [i._id for i in items])
+            self.assertEqual({i.entry("login") for i in loaded[1:]}, {"changed"})
+            db.close()
+
+    def test_save_retry(self) -> None:
+        for t in self.test_tbl:
+            for chunk_size in (0, 3):
+                db = self.__create_temp_db(t)
+                location = db.location()
+                first = PasswordItem({"url": "https://first.com", "login": "first", "password": "password"})
+                db.add_group(PasswordsGroup(name="Passwords", items=[first]))
+                db.save()
+                items = [PasswordItem({
+                    "url": f"https://site{i}.com",
+                    "login": f"login{i}",
+                    "password": "password",
+                }) for i in range(6)]
+                db.add_group(PasswordsGroup(name="New", items=items[:3]))
+                for item in items[3:]:
+                    db.group("Passwords").add_item(item)
+                first.entry("login", "changed")
+
+                # the save fails after the first chunk is committed, or before anything is with chunk_size=0
+                calls = []
+                update = sqlite_database._ModifiedState._update_items
+                def failing(state, chunk):
+                    calls.append(chunk)
+                    if len(calls) == 1:
+                        raise sqlite3.OperationalError("database is locked")
+                    update(state, chunk)
+
+                with mock.patch.object(sqlite_database._ModifiedState, "_update_items", failing):
+                    self.assertRaises(sqlite3.OperationalError, lambda: db.save(chunk_size=chunk_size))
+                    self.assertEqual(db.status(), Status.MODIFIED)
+                    self.assertEqual(db.search("changed")[0].ref, first)
+                    db.save(chunk_size=chunk_size)
+
+                self.assertEqual(db.status(), Status.OPENED)
+                db.close()
+
+                db = SQLiteDatabase(location)
+                db.open(t["master_key"])
+                self.assertEqual([i.entry("login") for i in db.group("New").items()], ["login0", "login1", "login2"])
+                self.assertEqual([i.entry("login") for i in db.group("Passwords").items()],
+                                 ["changed", "login3", "login4", "login5"])
+                self.assertEqual(db._cursor.execute("SELECT count(*) FROM item").fetchone()[0], 7)
+                db.close()
+
+    def test_save_retry_reencrypt(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(6)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            db.save()
+            db.master_key("new-master-key")
+
+            # the update of the last item fails, rows written before it must not stay under the new key
+            calls = []
+            update = sqlite_database._ModifiedState._update_items
+            def failing(state, chunk):
+                calls.append(chunk)
+                if items[-1] in chunk:
+                    raise sqlite3.OperationalError("database is locked")
+                update(state, chunk)
+
+            with mock.patch.object(sqlite_database._ModifiedState, "_update_items", failing):
+                self.assertRaises(sqlite3.OperationalError, lambda: db.save(chunk_size=2))
+            self.assertEqual(len(calls), 1)
+            db.close()
+
+            db = SQLiteDatabase(location)
+            self.assertRaises(ValueError, lambda: db.open("new-master-key"))
+            db.open(t["master_key"])
+            self.assertEqual([i.entry("login") for i in db.group("Passwords").items()], [f"login{i}" for i in range(6)])
+            db.master_key("new-master-key")
+            db.save(chunk_size=2)
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open("new-master-key")
+            self.assertEqual([i.entry("login") for i in db.group("Passwords").items()], [f"login{i}" for i in range(6)])
+            db.close()
+
+    def test_rename_swap(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            db.add_group(PasswordsGroup(name="A", items=[
+                PasswordItem({"url": "https://a.com", "login": "a", "password": "password"})]))
+            db.add_group(PasswordsGroup(name="B", items=[
+                PasswordItem({"url": "https://b.com", "login": "b", "password": "password"})]))
+            db.save()
+            db.group("A").name("tmp")
+            db.group("B").name("A")
+            db.group("tmp").name("B")
+            db.save()
+            self.assertEqual(db.status(), Status.OPENED)
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual([g.name() for g in db.groups()], ["B", "A"])
+            self.assertEqual(db.group("A").item(0).entry("login"), "b")
+            self.assertEqual(db.group("B").item(0).entry("login"), "a")
+            db.close()
+
+    def test_change_master_key(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            password = PasswordItem({
+                "url": "https://google.com",
+                "login": "login",
+                "password": "password",
+            })
+            db.add_group(PasswordsGroup(name="Passwords", items=[password]))
+            db.save()
+            db.master_key("new-master-key")
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            self.assertRaises(ValueError, lambda: db.open(t["master_key"]))
+            db.open("new-master-key")
+            db.master_key(t["master_key"])
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual(db.group("Passwords").item(0).data(), password.data())
+            db.close()
+
+    def test_profile(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            self.assertEqual(db.profile(), Profile.DURABLE)
+            self.assertEqual(db._connection.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            db.profile(Profile.FAST)
+            self.assertEqual(db._connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(db._connection.execute("PRAGMA synchronous").fetchone()[0], 0)
+            db.close()
+
+            db = SQLiteDatabase(location, Profile.BALANCED)
+            db.open(t["master_key"])
+            self.assertEqual(db._connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(db._connection.execute("PRAGMA temp_store").fetchone()[0], 2)
+            db.close()
+
+    def test_lazy_load(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(4)]
+            db.add_group(PasswordsGroup(name="First", items=items[:2]))
+            db.add_group(PasswordsGroup(name="Second", items=items[2:]))
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            first, second = db.group("First"), db.group("Second")
+            self.assertEqual(first._items, [])
+            self.assertEqual(len(first), 2)
+            self.assertEqual(second._items, [])
+            second.name("Renamed")
+            self.assertEqual([i.data() for i in second.items()], [i.data() for i in items[2:]])
+            self.assertEqual(second.item(0).group(), second)
+            self.assertEqual(db.status(), Status.MODIFIED)
+            db.close()
+
+    def test_paged_load(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "url": f"https://site{i}.com",
+                "login": f"login{i}",
+                "password": "password",
+            }) for i in range(10)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            group = db.group("Passwords")
+            self.assertEqual(len(group), 10)
+            self.assertEqual(group._items, [])
+            self.assertEqual([i.data() for i in group.items(2, 3)], [i.data() for i in items[2:5]])
+            self.assertEqual(len(group._items), 5)
+            self.assertEqual(group.item(6).data(), items[6].data())
+            self.assertEqual(len(group._items), 7)
+            self.assertEqual(group.items(8, 5)[-1].data(), items[9].data())
+            self.assertEqual([i.data() for i in group.items()], [i.data() for i in items])
+            self.assertEqual(len(group), 10)
+            db.close()
+
+    def test_verify(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            valid = PasswordItem({"url": "https://site.com", "login": "login", "password": "password"})
+            invalid = PasswordItem.trusted({"url": "not an url", "login": "login", "password": "password"})
+            db.add_group(PasswordsGroup(name="Passwords", items=[valid, invalid]))
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual(db.verify(), [])
+            items = db.group("Passwords").items()
+            self.assertEqual(db.verify(), [items[1]])
+            db.close()
+            self.assertRaises(ClosedError, db.verify)
 
     def test_add_group(self) -> None:
         for t in self.test_tbl:
@@ -95,6 +473,205 @@ class TestSQLite(unittest.TestCase):
             self.assertEqual(db.status(), Status.MODIFIED)
             self.assertEqual(db.group(group.name()), group)
             self.assertEqual(len(db.groups()), 1)
+            self.assertRaises(ValueError, lambda: db.add_group(PasswordsGroup(name="Passwords", items=[])))
+            db.close()
+
+    def test_add_groups(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            groups = [PasswordsGroup(name=f"Group {i}", items=[]) for i in range(100)]
+            db.add_groups(groups)
+            self.assertIs(db.groups(), db.groups())
+            self.assertEqual(db.index_of(groups[42]), 42)
+            self.assertRaises(ValueError, lambda: db.add_groups([PasswordsGroup(name="Group 0", items=[])]))
+            self.assertRaises(ValueError, lambda: groups[1].name("Group 2"))
+
+            groups[0].name("Renamed")
+            self.assertIs(db.group("Renamed"), groups[0])
+            self.assertEqual(db.index_of(groups[0]), 0)
+            db.remove_group(groups[1])
+            self.assertEqual(db.index_of(groups[2]), 1)
+            db.save()
+            self.assertIs(db._groups.get_id(groups[2]._id), groups[2])
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual([g.name() for g in db.groups()], ["Renamed"] + [f"Group {i}" for i in range(2, 100)])
+            db.close()
+
+    def test_events(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            events = []
+            db.listen(lambda database, event, group: events.append((event, group)))
+            group = PasswordsGroup(name="Passwords", items=[])
+            db.add_group(group)
+            group.name("Renamed")
+            db.name("Renamed")
+            db.remove_group(group)
+            db.save()
+            db.close()
+            self.assertEqual(events, [
+                (Event.GROUP_ADDED, group),
+                (Event.STATUS_CHANGED, None),
+                (Event.GROUP_RENAMED, group),
+                (Event.RENAMED, None),
+                (Event.GROUP_REMOVED, group),
+                (Event.STATUS_CHANGED, None),
+                (Event.STATUS_CHANGED, None),
+            ])
+
+    def test_search(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "title": f"Account {i}",
+                "url": f"https://mail.site{i}.com/login",
+                "login": f"user{i}",
+                "password": "password",
+            }) for i in range(10)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            self.assertEqual([m.ref for m in db.search("site3")], [items[3]])
+            db.save()
+            db.close()
+            self.assertRaises(ClosedError, lambda: db.search("site3"))
+            self.assertRaises(ClosedError, lambda: db.lookup_by_url("site3.com"))
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            db._indexer.join()
+            group = db.group("Passwords")
+            self.assertEqual(group._items, [])
+            self.assertEqual(len(db.search("mail")), 10)
+            self.assertEqual(db.search("login"), [])
+            match, = db.search("USER7 ite7")
+            self.assertEqual((match.group, match.title, match.detail), (group, "Account 7", "user7"))
+            self.assertEqual(search.item_of(match).data(), items[7].data())
+
+            item = group.item(2)
+            item.entry("login", "renamed")
+            self.assertEqual([m.ref for m in db.search("renamed")], [item])
+            self.assertEqual(db.search("user2"), [])
+            group.remove_item(group.item(5))
+            self.assertEqual(db.search("site5"), [])
+            new = PasswordItem({"url": "https://other.com", "login": "new", "password": "password"})
+            group.add_item(new)
+            db.save()
+            self.assertEqual([m.ref for m in db.search("other")], [new])
+            self.assertEqual(len(db._search), 10)
+            db.close()
+            self.assertEqual(len(db._search), 0)
+
+    def test_lookup_by_url(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            db.add_group(PasswordsGroup(name="Passwords", items=[PasswordItem({
+                "title": f"Account {i}",
+                "url": f"https://login.site{i % 10}.co.uk/path",
+                "login": f"user{i}",
+                "password": "password",
+            }) for i in range(500)]))
+            db.save()
+            db.close()
+
+            # rows are indexed in small chunks, the lookup waits for all of them
+            with mock.patch.object(sqlite_database, "DECRYPT_CHUNK_SIZE", 8):
+                db = SQLiteDatabase(location)
+                db.open(t["master_key"])
+                matches = db.lookup_by_url("site4.co.uk:443")
+
+            self.assertEqual(len(matches), 50)
+            self.assertEqual({m.title for m in matches}, {f"Account {i}" for i in range(4, 500, 10)})
+            self.assertEqual(db.lookup_by_url("site4.co.uk", limit=100)[0].score, 6)
+            self.assertEqual(db.lookup_by_url("co.uk"), [])
+            db.close()
+            self.assertRaises(ClosedError, lambda: db.lookup_by_url("site4.co.uk"))
+
+    def test_find(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            items = [PasswordItem({
+                "title": f"Account {i}",
+                "url": f"https://mail.site{i}.com/login",
+                "login": f"user{i}",
+                "password": "password",
+            }) for i in range(10)]
+            db.add_group(PasswordsGroup(name="Passwords", items=items))
+            self.assertEqual([m.ref for m in db.find(login="user3")], [items[3]])
+            db.save()
+            db.close()
+            self.assertRaises(ClosedError, lambda: db.find(login="user3"))
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            db._indexer.join()
+            group = db.group("Passwords")
+            with mock.patch.object(sqlite_database, "_decrypt_chunk", wraps=sqlite_database._decrypt_chunk) as decrypt:
+                match, = db.find(url="HTTP://Mail.Site3.com:8080/other", login=" USER3 ")
+                self.assertEqual(sum(len(c.args[2]) for c in decrypt.call_args_list), 1)
+            self.assertEqual((match.group, match.title, match.detail), (group, "Account 3", "user3"))
+            self.assertEqual(search.item_of(match).data(), items[3].data())
+            self.assertEqual(len(db.find(title="account")), 10)
+            self.assertEqual(db.find(title="account 3 mail"), [])
+            self.assertEqual(db.find(login="user"), [])
+            self.assertEqual(db.find(), [])
+
+            item = group.item(2)
+            item.entry("login", "renamed")
+            self.assertEqual([m.ref for m in db.find(login="renamed")], [item])
+            self.assertEqual(db.find(login="user2"), [])
+            group.remove_item(group.item(5))
+            self.assertEqual(db.find(title="5"), [])
+            new = PasswordItem({"title": "Account new", "url": "https://other.com", "login": "new", "password": "password"})
+            group.add_item(new)
+            self.assertEqual([m.ref for m in db.find(login="new")], [new])
+            db.save()
+            self.assertEqual([m.ref for m in db.find(login="new")], [new])
+            self.assertEqual([m.ref for m in db.find(login="renamed")], [item])
+            self.assertEqual(len(db.find(title="account")), 10)
+
+            db.master_key("new-master-key")
+            self.assertEqual([m.ref for m in db.find(url="other.com")], [new])
+            db.save()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open("new-master-key")
+            db._indexer.join()
+            with mock.patch.object(db, "_decrypt_many", wraps=db._decrypt_many) as decrypt:
+                self.assertEqual([m.title for m in db.find(url="other.com")], ["Account new"])
+                self.assertEqual(len(decrypt.call_args.args[0]), 1)
+            db.close()
+
+    def test_find_legacy(self) -> None:
+        for t in self.test_tbl:
+            db = self.__create_temp_db(t)
+            location = db.location()
+            db.add_group(PasswordsGroup(name="Passwords", items=[PasswordItem({
+                "title": f"Account {i}",
+                "url": "https://site.com",
+                "login": f"user{i}",
+                "password": "password",
+            }) for i in range(3)]))
+            db.save()
+            # databases upgraded from an older schema have no tokens yet
+            db._cursor.execute("DELETE FROM item_index")
+            db._cursor.execute("UPDATE meta SET index_check = NULL")
+            db._connection.commit()
+            db.close()
+
+            db = SQLiteDatabase(location)
+            db.open(t["master_key"])
+            self.assertEqual([m.title for m in db.find(url="site.com", login="user1")], ["Account 1"])
+            self.assertEqual(db._cursor.execute("SELECT count(*) FROM item_index").fetchone()[0], 3 * 4)
+            db.group("Passwords").remove()
+            db.save()
+            self.assertEqual(db._cursor.execute("SELECT count(*) FROM item_index").fetchone()[0], 0)
             db.close()
 
     def test_remove_group(self) -> None:
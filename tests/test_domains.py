@@ -0,0 +1,46 @@
+import unittest
+
+from lib.core.domains import DomainTrie, labels, suffix_length
+
+
+class TestDomainTrie(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.trie = DomainTrie()
+        for key, host in enumerate([
+            "example.co.uk",
+            "login.example.co.uk",
+            "mail.example.co.uk",
+            "other.co.uk",
+            "co.uk",
+            "alice.github.io",
+            "bob.github.io",
+            "192.168.0.1",
+        ]):
+            self.trie.add(host, key)
+
+    def test_labels(self) -> None:
+        self.assertEqual(labels("login.example.co.uk."), ["uk", "co", "example", "login"])
+        self.assertEqual(labels("192.168.0.1"), ["192.168.0.1"])
+        self.assertEqual(labels(""), [])
+        self.assertEqual(suffix_length(labels("login.example.co.uk")), 2)
+        self.assertEqual(suffix_length(labels("example.com")), 1)
+
+    def test_lookup(self) -> None:
+        self.assertEqual(sorted(self.trie.lookup("login.example.co.uk"), reverse=True), [(9, 1), (7, 0), (6, 2)])
+        self.assertEqual(sorted(self.trie.lookup("www.example.co.uk"), reverse=True), [(7, 0), (6, 2), (6, 1)])
+        self.assertEqual(sorted(self.trie.lookup("example.co.uk"), reverse=True), [(7, 0), (6, 2), (6, 1)])
+        self.assertEqual(list(self.trie.lookup("co.uk")), [(5, 4)])
+        self.assertEqual(list(self.trie.lookup("new.co.uk")), [])
+        self.assertEqual(list(self.trie.lookup("alice.github.io")), [(7, 5)])
+        self.assertEqual(list(self.trie.lookup("192.168.0.1")), [(3, 7)])
+        self.assertEqual(list(self.trie.lookup("168.0.1")), [])
+
+    def test_remove(self) -> None:
+        self.trie.remove("login.example.co.uk", 1)
+        self.trie.remove("missing.example.co.uk", 0)
+        self.assertEqual(sorted(self.trie.lookup("login.example.co.uk"), reverse=True), [(7, 0), (6, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
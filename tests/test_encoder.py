@@ -31,6 +31,14 @@ class TestBase32(unittest.TestCase):
         for t in self.test_tbl:
             self.assertEqual(self.encoder.decode(t["expect"].encode()), t["data"].encode())
 
+    def test_encode_many(self) -> None:
+        data = [t["data"].encode() for t in self.test_tbl]
+        self.assertEqual(self.encoder.encode_many(data), [t["expect"].encode() for t in self.test_tbl])
+
+    def test_decode_many(self) -> None:
+        data = [t["expect"].encode() for t in self.test_tbl]
+        self.assertEqual(self.encoder.decode_many(data), [t["data"].encode() for t in self.test_tbl])
+
     def test_id(self) -> None:
         self.assertEqual(self.encoder.id(), ID.BASE32)
 
@@ -62,6 +70,14 @@ class TestBase64(unittest.TestCase):
         for t in self.test_tbl:
             self.assertEqual(self.encoder.decode(t["expect"].encode()), t["data"].encode())
 
+    def test_encode_many(self) -> None:
+        data = [t["data"].encode() for t in self.test_tbl]
+        self.assertEqual(self.encoder.encode_many(data), [t["expect"].encode() for t in self.test_tbl])
+
+    def test_decode_many(self) -> None:
+        data = [t["expect"].encode() for t in self.test_tbl]
+        self.assertEqual(self.encoder.decode_many(data), [t["data"].encode() for t in self.test_tbl])
+
     def test_id(self) -> None:
         self.assertEqual(self.encoder.id(), ID.BASE64)
 
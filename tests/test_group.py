@@ -51,3 +51,20 @@ class TestPasswordsGroup(unittest.TestCase):
         self.assertEqual(len(group.items()), 1)
         group.remove_item(password)
         self.assertEqual(len(group.items()), 0)
+
+    def test_index_of(self) -> None:
+        items = [PasswordItem({
+            "url": "https://google.com",
+            "login": f"login{i}",
+            "password": "password",
+        }) for i in range(6)]
+        group = PasswordsGroup(name="Passwords", items=items)
+        self.assertEqual([group.index_of(i) for i in items], list(range(6)))
+        group.remove_item(items[1])
+        self.assertEqual(group.index_of(items[5]), 4)
+        self.assertRaises(ValueError, lambda: group.index_of(items[1]))
+
+        group.remove_items([items[4], items[0], items[2]])
+        self.assertEqual(group.items(), [items[3], items[5]])
+        self.assertEqual([group.index_of(i) for i in group.items()], [0, 1])
+        self.assertRaises(ValueError, lambda: group.remove_items([items[0]]))
@@ -0,0 +1,21 @@
+import sys
+import unittest
+import subprocess
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_import_without_qt(self) -> None:
+        code = "\n".join([
+            "import sys",
+            "sys.modules['PyQt5'] = None",
+            "import lib.crypto.cipher, lib.crypto.hasher, lib.crypto.encoder",
+            "import lib.core.config, lib.core.sqlite_database, lib.core.data.factory",
+            "assert not any(m.startswith('PyQt5.') for m in sys.modules)",
+        ])
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -91,6 +91,14 @@ class TestPasswordItem(unittest.TestCase):
             password = PasswordItem(t)
             self.assertRaises(IDError, lambda: password.delete())
 
+    def test_trusted(self) -> None:
+        for t in self.test_tbl:
+            password = PasswordItem.trusted(t)
+            self.assertEqual(password.data(), PasswordItem(t).data())
+            self.assertTrue(password.verify())
+            self.assertFalse(PasswordItem.trusted({**t, "url": "not an url"}).verify())
+            self.assertFalse(PasswordItem.trusted({"url": t["url"]}).verify())
+
 
 if __name__ == "__main__":
     unittest.main()
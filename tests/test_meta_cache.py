@@ -0,0 +1,57 @@
+import os
+import unittest
+import tempfile
+
+from lib.core.meta_cache import MetaCache
+from lib.core.sqlite_database import SQLiteDatabase
+
+from lib.crypto import hasher
+from lib.crypto import cipher
+from lib.crypto import encoder
+from lib.crypto import generate
+
+
+class TestMetaCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.location = os.path.join(tempfile.gettempdir(), generate.string(10))
+        self.path = os.path.join(tempfile.gettempdir(), generate.string(10))
+        db = SQLiteDatabase.create(self.location, "Personal", "master-key",
+            hasher.SHA256, cipher.AES_CBC, encoder.Base64)
+        db.close()
+
+    def tearDown(self) -> None:
+        for path in (self.location, self.path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_roundtrip(self) -> None:
+        cache = MetaCache(self.path)
+        cache.put(self.location, SQLiteDatabase(self.location)._meta)
+        cache.save()
+
+        cache = MetaCache(self.path)
+        cache.load()
+        self.assertFalse(cache.stale(self.location))
+        db = SQLiteDatabase(self.location, meta=cache.get(self.location))
+        self.assertEqual(db.name(), "Personal")
+        self.assertEqual(db._meta["cipher"], cipher.AES_CBC)
+
+        db.open("master-key")
+        self.assertIn("master_key_hash", db._meta)
+        db.close()
+
+    def test_stale(self) -> None:
+        cache = MetaCache(self.path)
+        self.assertTrue(cache.stale(self.location))
+        cache.put(self.location, SQLiteDatabase(self.location)._meta)
+        st = os.stat(self.location)
+        os.utime(self.location, (st.st_atime, st.st_mtime + 10))
+        self.assertTrue(cache.stale(self.location))
+
+        cache.remove(self.location)
+        self.assertIsNone(cache.get(self.location))
+
+
+if __name__ == "__main__":
+    unittest.main()
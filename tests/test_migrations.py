@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import unittest
+import tempfile
+
+from lib.core import migrations
+from lib.crypto import generate
+
+
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE meta (
+        name TEXT NOT NULL,
+        master_key_hash BLOB NOT NULL,
+        hash_salt BLOB NOT NULL,
+        cipher_salt BLOB,
+        cipher_id TEXT NOT NULL,
+        hasher_id TEXT NOT NULL,
+        encoder_id TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE `group` (
+        name TEXT PRIMARY KEY,
+        type TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE item (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        group_name TEXT NOT NULL,
+        data BLOB NOT NULL,
+
+        FOREIGN KEY(group_name) REFERENCES `group`(name) ON DELETE CASCADE
+    );
+    """,
+]
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.location = os.path.join(tempfile.gettempdir(), generate.string(10))
+        self.connection = sqlite3.connect(self.location)
+        for statement in LEGACY_SCHEMA:
+            self.connection.execute(statement)
+
+        self.connection.execute("INSERT INTO `group` VALUES ('Passwords', 'Password')")
+        self.connection.executemany("INSERT INTO item(group_name, data) VALUES (?, ?)", [
+            ("Passwords", b"kept"),
+            ("Removed", b"orphan"),
+            ("Passwords", b"deleted"),
+        ])
+        self.connection.execute("DELETE FROM item WHERE id = 3")
+        self.connection.commit()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        os.remove(self.location)
+
+    def test_upgrade(self) -> None:
+        self.assertEqual(migrations.version(self.connection), 0)
+        migrations.upgrade(self.connection)
+        self.assertEqual(migrations.version(self.connection), migrations.VERSION)
+        rows = self.connection.execute("""
+            SELECT item.id, `group`.name, item.data
+            FROM item JOIN `group` ON `group`.id = item.group_id
+        """).fetchall()
+        self.assertEqual(rows, [(1, "Passwords", b"kept")])
+        plan = self.connection.execute("EXPLAIN QUERY PLAN SELECT id FROM item WHERE group_id = 1").fetchall()
+        self.assertIn("USING", plan[0][-1])
+        seq = self.connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'item'").fetchone()
+        self.assertEqual(seq[0], 3)
+
+    def test_foreign_keys(self) -> None:
+        migrations.upgrade(self.connection)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("DELETE FROM `group` WHERE name = 'Passwords'")
+        self.assertEqual(self.connection.execute("SELECT count(*) FROM item").fetchone()[0], 0)
+
+    def test_item_index(self) -> None:
+        migrations.upgrade(self.connection)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.assertIn("index_check", [c[1] for c in self.connection.execute("PRAGMA table_info(meta)")])
+        self.connection.execute("INSERT INTO item_index(token, item_id) VALUES (x'01', 1), (x'02', 1)")
+        plan = self.connection.execute("EXPLAIN QUERY PLAN SELECT item_id FROM item_index WHERE token = x'01'").fetchall()
+        self.assertIn("USING", plan[0][-1])
+        self.connection.execute("DELETE FROM item WHERE id = 1")
+        self.assertEqual(self.connection.execute("SELECT count(*) FROM item_index").fetchone()[0], 0)
+
+    def test_upgrade_twice(self) -> None:
+        migrations.upgrade(self.connection)
+        migrations.upgrade(self.connection)
+        self.assertEqual(migrations.version(self.connection), migrations.VERSION)
+
+    def test_newer_version(self) -> None:
+        self.connection.execute(f"PRAGMA user_version = {migrations.VERSION + 1}")
+        self.assertRaises(migrations.MigrationError, lambda: migrations.upgrade(self.connection))
+
+
+if __name__ == "__main__":
+    unittest.main()
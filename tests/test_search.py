@@ -0,0 +1,89 @@
+import unittest
+
+from lib.core.search import SearchIndex, host, grams
+from lib.core.data.item import PasswordItem
+from lib.core.data.group import PasswordsGroup
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.group = PasswordsGroup(name="Passwords", items=[])
+        self.index = SearchIndex()
+        self.generation = self.index.begin()
+        self.index.add_many(self.generation, [
+            (self.group, 1, {"title": "Bank", "url": "https://online.bank.com/login", "login": "anna"}),
+            (self.group, 2, {"title": "Mail", "url": "https://mail.com", "login": "banker"}),
+            (self.group, 3, {"title": "Forum", "url": "forum.org", "email": "anna@mail.com"}),
+        ])
+        self.index.finish(self.generation)
+
+    def test_host(self) -> None:
+        self.assertEqual(host("https://User@Mail.Example.com:443/path"), "mail.example.com")
+        self.assertEqual(host("example.com/path"), "example.com")
+        self.assertEqual(grams(["ab"]), {"^^a", "^ab", "ab$"})
+
+    def test_search(self) -> None:
+        self.assertEqual([m.ref for m in self.index.search("bank")], [1, 2])
+        self.assertEqual([m.ref for m in self.index.search("ank")], [1, 2])
+        self.assertEqual([m.ref for m in self.index.search("b")], [1, 2])
+        self.assertEqual([m.ref for m in self.index.search("ANNA mail")], [3])
+        self.assertEqual([m.ref for m in self.index.search("login")], [])
+        self.assertEqual(self.index.search("Mail")[0].title, "Mail")
+        self.assertEqual(self.index.search(" - "), [])
+
+    def test_search_ranking(self) -> None:
+        generation = self.index.begin()
+        self.index.add_many(generation, [
+            (self.group, key, {"title": f"Account {key}", "login": "accountant" if key % 7 else "zeta"})
+            for key in range(1, 1001)
+        ])
+        self.index.finish(generation)
+        self.assertEqual([m.score for m in self.index.search("account", limit=3)], [12, 12, 12])
+        self.assertEqual(sorted(m.ref for m in self.index.search("account zeta", limit=200)), list(range(7, 1001, 7)))
+        self.assertEqual([m.score for m in self.index.search("acc 7", limit=2)], [20, 16])
+
+    def test_lookup(self) -> None:
+        self.assertEqual([m.ref for m in self.index.lookup("HTTPS://Online.Bank.com:8443/other")], [1])
+        self.assertEqual([m.ref for m in self.index.lookup("www.bank.com")], [1])
+        self.assertEqual([m.ref for m in self.index.lookup("forum.org.")], [3])
+        self.assertEqual(self.index.lookup("com"), [])
+        item = PasswordItem({"url": "https://bank.com", "login": "new", "password": "password"})
+        self.group.add_item(item)
+        self.index.update(item)
+        self.assertEqual([m.ref for m in self.index.lookup("online.bank.com")], [1, item])
+        item.entry("url", "https://shop.com")
+        self.index.update(item)
+        self.assertEqual([m.ref for m in self.index.lookup("online.bank.com")], [1])
+        self.index.remove_group(self.group)
+        self.assertEqual(self.index.lookup("online.bank.com"), [])
+
+    def test_changes(self) -> None:
+        item = PasswordItem({"url": "https://shop.com", "login": "new", "password": "password"})
+        self.group.add_item(item)
+        self.index.update(item)
+        self.assertEqual([m.ref for m in self.index.search("shop")], [item])
+        item._set_id(4)
+        self.index.rekey(item)
+        self.assertEqual(len(self.index), 4)
+        self.index.remove(item)
+        self.assertEqual(self.index.search("shop"), [])
+        self.index.remove_group(self.group)
+        self.assertEqual(len(self.index), 0)
+
+    def test_build(self) -> None:
+        item = PasswordItem.trusted({"title": "Edited", "url": "https://bank.com", "login": "anna"})
+        item._set_id(1)
+        item._group = self.group
+        generation = self.index.begin()
+        self.index.update(item)
+        # rows read before the edit do not replace it
+        self.index.add_many(generation, [(self.group, 1, {"title": "Bank"}), (self.group, 2, {"title": "Mail"})])
+        self.assertEqual([m.title for m in self.index.search("bank")], ["Edited"])
+        self.index.clear()
+        self.assertFalse(self.index.add_many(generation, [(self.group, 3, {"title": "Forum"})]))
+        self.assertEqual(self.index.search("forum"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
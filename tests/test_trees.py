@@ -0,0 +1,70 @@
+import os
+import unittest
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from ui.gui.trees import _DatabasesTreeModel
+from lib.core.database import Status
+from lib.core.sqlite_database import SQLiteDatabase
+from lib.core.data.item import PasswordItem
+from lib.core.data.group import PasswordsGroup
+
+from lib.crypto import hasher
+from lib.crypto import cipher
+from lib.crypto import encoder
+from lib.crypto import generate
+
+
+class TestDatabasesTreeModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.db = SQLiteDatabase.create(
+            location=os.path.join(tempfile.gettempdir(), generate.string(10)),
+            name="Personal",
+            master_key="master-key",
+            hasher=hasher.SHA256,
+            cipher=cipher.AES_CBC,
+            encoder=encoder.Base64,
+        )
+        self.model = _DatabasesTreeModel()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        os.remove(self.db.location())
+
+    def test_remove_last_group(self) -> None:
+        group = PasswordsGroup(name="Passwords", items=[
+            PasswordItem({"url": "https://site.com", "login": "login", "password": "password"})])
+        self.db.add_group(group)
+        self.db.save()
+        self.model.addDatabase(self.db)
+        parent = self.model.databaseIndex(self.db)
+        self.assertEqual(self.model.rowCount(parent), 1)
+
+        group.remove()
+        self.assertEqual(self.db.status(), Status.MODIFIED)
+        self.assertEqual(self.model.rowCount(parent), 0)
+        self.db.add_group(PasswordsGroup(name="Other", items=[]))
+        self.assertEqual(self.model.rowCount(parent), 1)
+
+    def test_lock(self) -> None:
+        self.db.add_group(PasswordsGroup(name="Passwords", items=[]))
+        self.db.save()
+        self.model.addDatabase(self.db)
+        parent = self.model.databaseIndex(self.db)
+        self.db.close()
+        self.assertEqual(self.model.rowCount(parent), 0)
+        self.db.open("master-key")
+        self.assertEqual(self.model.rowCount(parent), 1)
+        self.assertIsNotNone(self.model.group(self.model.index(0, 0, parent)))
+
+
+if __name__ == "__main__":
+    unittest.main()
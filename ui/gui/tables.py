@@ -1,34 +1,92 @@
 
+import typing
+import bisect
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 
 from lib.core.data.group import Type, GroupInterface, PasswordsGroup, CardsGroup, IdentitiesGroup
-from lib.core.data.item import ItemInterface
+from lib.core.data.item import ItemInterface, CARD_EXPIRATION_RE
 
 
-class _PasswordsGroupModel(QAbstractTableModel):
+FETCH_PAGE_SIZE = 256
 
-    def __init__(self, group: PasswordsGroup, *args, **kwargs):
+_ICONS = {}
+
+
+def _icon(name: str) -> QIcon:
+    ''' icons are created once and shared by all table models '''
+    icon = _ICONS.get(name)
+    if icon is None:
+        icon = _ICONS[name] = QIcon(name)
+
+    return icon
+
+
+def _number_key(value: str) -> int:
+    digits = "".join(ch for ch in value if ch.isdigit())
+    return int(digits) if digits else -1
+
+
+def _expiration_key(value: str) -> typing.Tuple[int, int]:
+    if CARD_EXPIRATION_RE.match(value) is None:
+        return -1, -1
+
+    month, year = value.split("/")
+    return int(year), int(month)
+
+
+def _bisect(keys: typing.List[typing.Any], key: typing.Any, descending: bool) -> int:
+    ''' position after the keys equal to `key` in a list sorted in either direction '''
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (keys[mid] < key) if descending else (key < keys[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
+
+
+class _Column(typing.NamedTuple):
+    header: str
+    field: str
+    icon: str | None = None
+    masked: bool = False
+    key: typing.Callable[[str], typing.Any] = str.casefold
+
+
+class _GroupModel(QAbstractTableModel):
+    ''' rows are rendered once into display strings and a search key, until their item changes '''
+    COLUMNS: typing.Tuple[_Column, ...] = ()
+
+    def __init__(self, group: GroupInterface, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.group = group
-        self.headers = ["Title", "URL", "Login", "Email" , "Password", "Notes"]
+        self.headers = [c.header for c in self.COLUMNS]
+        self._fields = tuple(c.field for c in self.COLUMNS)
+        self._masked = tuple(c.masked for c in self.COLUMNS)
+        # {id(item): (item, display values, search key)}
+        self._rows = {}
+        self._fetched = 0
+        # sort keys per column, computed on first sort by that column: [{id(item): key}]
+        self._keys = [{} for _ in self.COLUMNS]
+        self._sort_column = -1
+        self._descending = False
+        # items and their keys in sorted order, None keeps the group order
+        self._order = None
+        self._order_keys = None
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole) -> QVariant:
         if orientation == Qt.Vertical:
             return QVariant()
-        
+
+        column = self.COLUMNS[section]
         if role == Qt.DisplayRole:
-            return self.headers[section]
-        elif role == Qt.DecorationRole:
-            if section == 1:
-                return QIcon(":/icons/url")
-            elif section == 2:
-                return QIcon(":/icons/user")
-            elif section == 3:
-                return QIcon(":/icons/email")
-            elif section == 4:
-                return QIcon(":/icons/key-solid")
+            return column.header
+        elif role == Qt.DecorationRole and column.icon is not None:
+            return _icon(column.icon)
 
         return QVariant()
 
@@ -36,85 +94,416 @@ class _PasswordsGroupModel(QAbstractTableModel):
         if not index.isValid():
             return QVariant()
 
-        item = self.group.items()[index.row()]
         if role == Qt.DisplayRole:
-            if index.column() == 4:
-                return "*" * len(item.entry("password"))
-
-            return item.entry(self.headers[index.column()].lower())
+            return self.display(index.row())[index.column()]
 
-        if role == Qt.TextAlignmentRole and index.column() == 4:
+        if role == Qt.TextAlignmentRole and self._masked[index.column()]:
             return Qt.AlignCenter
 
         return QVariant()
 
-    def rowCount(self, index: QModelIndex) -> int:
-        return len(self.group.items())
+    def rowCount(self, index: QModelIndex = QModelIndex()) -> int:
+        return 0 if index.isValid() else self._fetched
 
-    def columnCount(self, index: QModelIndex) -> int:
-        return len(self.headers)
+    def columnCount(self, index: QModelIndex = QModelIndex()) -> int:
+        return len(self.COLUMNS)
 
+    def canFetchMore(self, index: QModelIndex = QModelIndex()) -> bool:
+        return not index.isValid() and self._fetched < len(self.group)
 
-class _CardsGroupModel(QAbstractTableModel):
+    def fetchMore(self, index: QModelIndex = QModelIndex()) -> None:
+        if index.isValid():
+            return
 
-    def __init__(self, group: CardsGroup, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.group = group
-        self.headers = ["Title", "Holder", "Number", "CVV", "Expiration", "Notes"]
+        # the group decrypts a page only when it is fetched
+        count = len(self.group.items(self._fetched, FETCH_PAGE_SIZE))
+        if count == 0:
+            return
 
-    def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole) -> QVariant:
-        if orientation == Qt.Vertical or role != Qt.DisplayRole:
-            return QVariant()
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
 
-        return self.headers[section]
+    def fetchAll(self) -> None:
+        if self._fetched >= len(self.group):
+            return
 
-    def data(self, index: QModelIndex, role: Qt.ItemDataRole) -> QVariant:
-        if not index.isValid():
-            return QVariant()
+        self.group.items()
+        self.beginInsertRows(QModelIndex(), self._fetched, len(self.group) - 1)
+        self._fetched = len(self.group)
+        self.endInsertRows()
 
-        if role == Qt.DisplayRole:
-            data = self.group.items()[index.row()].entry(self.headers[index.column()].lower())
-            if index.column() == 3:
-                return "*" * len(data)
-            
-            return data
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        # masked columns are not sortable, their order would leak the secrets
+        if column >= 0 and self._masked[column]:
+            return
 
-        if role == Qt.TextAlignmentRole and index.column() == 3:
-            return Qt.AlignCenter
+        descending = order == Qt.DescendingOrder
+        if column == self._sort_column and (column < 0 or descending == self._descending):
+            return
 
-    def rowCount(self, index: QModelIndex) -> int:
-        return len(self.group)
+        self.fetchAll()
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        moved = [self.item(index.row()) for index in persistent]
+        self._sort_column, self._descending = column, descending
+        if column < 0:
+            self._order = self._order_keys = None
+        else:
+            items = self.group.items()
+            keys, key, field = self._keys[column], self.COLUMNS[column].key, self._fields[column]
+            for item in items:
+                if id(item) not in keys:
+                    keys[id(item)] = key(item.entry(field))
+
+            values = [keys[id(item)] for item in items]
+            # the group order breaks ties, python sorts are stable in both directions
+            rows = sorted(range(len(items)), key=values.__getitem__, reverse=descending)
+            self._order = [items[row] for row in rows]
+            self._order_keys = [values[row] for row in rows]
+
+        if persistent:
+            rows = {id(item): row for row, item in enumerate(self.items())}
+            self.changePersistentIndexList(persistent, [self.index(rows[id(item)], index.column())
+                                                        for item, index in zip(moved, persistent)])
+        self.layoutChanged.emit()
+
+    def insertItem(self, item: ItemInterface) -> None:
+        if self._order is not None:
+            key = self.__key(self._sort_column, item)
+            pos = _bisect(self._order_keys, key, self._descending)
+            self.group.add_item(item)
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self._order.insert(pos, item)
+            self._order_keys.insert(pos, key)
+            self._fetched += 1
+            self.endInsertRows()
+            return
+
+        # rows past the fetched ones are shown by fetchMore
+        if self._fetched < len(self.group):
+            self.group.add_item(item)
+            return
 
-    def columnCount(self, index: QModelIndex) -> int:
-        return len(self.headers)
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched)
+        self.group.add_item(item)
+        self._fetched += 1
+        self.endInsertRows()
 
+    def removeItem(self, item: ItemInterface) -> None:
+        pos = self.rowOf(item)
+        self.beginRemoveRows(QModelIndex(), pos, pos)
+        self.group.remove_item(item)
+        if self._order is not None:
+            del self._order[pos]
+            del self._order_keys[pos]
+        self.__forget(item)
+        self._fetched -= 1
+        self.endRemoveRows()
 
-class _IdenitiesGroupModel(QAbstractTableModel):
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.group.remove_items(list(self.group.items()))
+        self._rows.clear()
+        for keys in self._keys:
+            keys.clear()
+        if self._order is not None:
+            self._order, self._order_keys = [], []
+        self._fetched = 0
+        self.endResetModel()
+
+    def item(self, row: int) -> ItemInterface:
+        return self.group.item(row) if self._order is None else self._order[row]
+
+    def items(self) -> typing.List[ItemInterface]:
+        return self.group.items(0, self._fetched) if self._order is None else self._order
+
+    def display(self, row: int) -> typing.Tuple[str, ...]:
+        return self.__row(self.item(row))[1]
+
+    def searchKey(self, item: ItemInterface) -> str:
+        return self.__row(item)[2]
+
+    def itemChanged(self, item: ItemInterface) -> None:
+        row = self.rowOf(item)
+        self.__forget(item)
+        if self._order is not None:
+            # only the edited row is moved, the rest of the order is still sorted
+            del self._order[row], self._order_keys[row]
+            key = self.__key(self._sort_column, item)
+            pos = _bisect(self._order_keys, key, self._descending)
+            self._order.insert(row, item)
+            self._order_keys.insert(row, key)
+            if pos != row:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._order[row], self._order_keys[row]
+                self._fetched -= 1
+                self.endRemoveRows()
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._order.insert(pos, item)
+                self._order_keys.insert(pos, key)
+                self._fetched += 1
+                self.endInsertRows()
+                return
+
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def rowOf(self, item: ItemInterface) -> int:
+        if self._order is None:
+            return self.group.index_of(item)
+
+        # the cached key still holds the value the item was sorted by
+        key = self.__key(self._sort_column, item)
+        row = _bisect(self._order_keys, key, self._descending) - 1
+        while self._order[row] is not item:
+            row -= 1
+
+        return row
+
+    def __key(self, column: int, item: ItemInterface) -> typing.Any:
+        keys = self._keys[column]
+        key = keys.get(id(item))
+        if key is None:
+            key = keys[id(item)] = self.COLUMNS[column].key(item.entry(self._fields[column]))
+
+        return key
+
+    def __forget(self, item: ItemInterface) -> None:
+        self._rows.pop(id(item), None)
+        for keys in self._keys:
+            keys.pop(id(item), None)
+
+    def __row(self, item: ItemInterface) -> typing.Tuple[ItemInterface, typing.Tuple[str, ...], str]:
+        cached = self._rows.get(id(item))
+        if cached is None or cached[0] is not item:
+            values = tuple("*" * len(item.entry(f)) if masked else item.entry(f)
+                           for f, masked in zip(self._fields, self._masked))
+            # masked columns are not searchable, fields are separated so a query cannot span two of them
+            key = "\n".join(v for v, masked in zip(values, self._masked) if not masked).casefold()
+            cached = self._rows[id(item)] = (item, values, key)
+
+        return cached
+
+
+class _PasswordsGroupModel(_GroupModel):
+    COLUMNS = (
+        _Column("Title", "title"),
+        _Column("URL", "url", ":/icons/url"),
+        _Column("Login", "login", ":/icons/user"),
+        _Column("Email", "email", ":/icons/email"),
+        _Column("Password", "password", ":/icons/key-solid", masked=True),
+        _Column("Notes", "notes"),
+    )
+
+
+class _CardsGroupModel(_GroupModel):
+    COLUMNS = (
+        _Column("Title", "title"),
+        _Column("Holder", "holder"),
+        _Column("Number", "number", key=_number_key),
+        _Column("CVV", "cvv", masked=True),
+        _Column("Expiration", "expiration", key=_expiration_key),
+        _Column("Notes", "notes"),
+    )
+
+
+class _IdenitiesGroupModel(_GroupModel):
+    COLUMNS = (
+        _Column("Title", "title"),
+        _Column("Full Name", "full_name"),
+        _Column("Phone", "phone"),
+        _Column("Email", "email"),
+        _Column("Notes", "notes"),
+    )
+
+
+class _QuickFilterProxyModel(QAbstractProxyModel):
+    ''' rows whose search key contains the query, a longer query only rechecks previous matches
+
+    QSortFilterProxyModel calls filterAcceptsRow for every source row on each change,
+    here the matching source rows are kept in a sorted list that is edited as the source changes.
+    '''
 
-    def __init__(self, group: IdentitiesGroup, *args, **kwargs):
+    def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.group = group
-        self.headers = ["Title", "Full Name", "Phone", "Email", "Notes"]
+        self._query = ""
+        # matching source rows in ascending order, None shows every row
+        self._rows = None
+        self._count = 0
+        self._removing = None
+        self._connections = []
+
+    def setSourceModel(self, model: _GroupModel) -> None:
+        self.beginResetModel()
+        for connection in self._connections:
+            self.disconnect(connection)
+
+        super().setSourceModel(model)
+        self._query = ""
+        self._rows = None
+        self._count = model.rowCount()
+        self._connections = [
+            model.rowsInserted.connect(self.__onRowsInserted),
+            model.rowsAboutToBeRemoved.connect(self.__onRowsAboutToBeRemoved),
+            model.rowsRemoved.connect(self.__onRowsRemoved),
+            model.dataChanged.connect(self.__onDataChanged),
+            model.modelAboutToBeReset.connect(self.beginResetModel),
+            model.modelReset.connect(self.__onReset),
+            model.layoutAboutToBeChanged.connect(self.beginResetModel),
+            model.layoutChanged.connect(self.__onReset),
+        ]
+        self.endResetModel()
+
+    def query(self) -> str:
+        return self._query
+
+    def setQuery(self, query: str) -> None:
+        query = query.casefold()
+        if query == self._query:
+            return
 
-    def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole) -> Qt.ItemDataRole:
-        if orientation == Qt.Vertical or role != Qt.DisplayRole:
-            return QVariant()
+        source = self.sourceModel()
+        narrowing = self._rows is not None and query.startswith(self._query)
+        if query and not narrowing:
+            source.fetchAll()
+
+        self.beginResetModel()
+        if not query:
+            self._rows = None
+            self._count = source.rowCount()
+        elif narrowing:
+            self._rows = [r for r in self._rows if query in source.searchKey(source.item(r))]
+        else:
+            self._rows = [r for r, item in enumerate(source.items()) if query in source.searchKey(item)]
 
-        return self.headers[section]
+        self._query = query
+        self.endResetModel()
 
-    def data(self, index: QModelIndex, role: Qt.ItemDataRole) -> QVariant:
-        if not index.isValid() or role != Qt.DisplayRole:
-            return QVariant()
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
 
-        item = self.group.items()[index.row()]
-        key = "full_name" if index.column() == 1 else self.headers[index.column()].lower()
-        return item.entry(key)
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
 
-    def rowCount(self, index: QModelIndex) -> int:
-        return len(self.group.items())
+        return self._count if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+
+        return self.sourceModel().columnCount()
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.rowCount() > 0
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole) -> QVariant:
+        return self.sourceModel().headerData(section, orientation, role)
 
-    def columnCount(self, index: QModelIndex) -> int:
-        return len(self.headers)
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return self._rows is None and self.sourceModel().canFetchMore(QModelIndex())
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if self._rows is None:
+            self.sourceModel().fetchMore(QModelIndex())
+
+    def mapToSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+
+        row = index.row() if self._rows is None else self._rows[index.row()]
+        return self.sourceModel().index(row, index.column())
+
+    def mapFromSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        elif self._rows is None:
+            return self.index(index.row(), index.column())
+
+        pos = bisect.bisect_left(self._rows, index.row())
+        if pos == len(self._rows) or self._rows[pos] != index.row():
+            return QModelIndex()
+
+        return self.index(pos, index.column())
+
+    def __matches(self, row: int) -> bool:
+        source = self.sourceModel()
+        return self._query in source.searchKey(source.item(row))
+
+    def __onRowsInserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            # rows map to themselves, so they are inserted where the source put them, not at the end
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._count += last - first + 1
+            self.endInsertRows()
+            return
+
+        count = last - first + 1
+        pos = bisect.bisect_left(self._rows, first)
+        self._rows[pos:] = [r + count for r in self._rows[pos:]]
+        inserted = [r for r in range(first, last + 1) if self.__matches(r)]
+        if inserted:
+            self.beginInsertRows(QModelIndex(), pos, pos + len(inserted) - 1)
+            self._rows[pos:pos] = inserted
+            self.endInsertRows()
+
+    def __onRowsAboutToBeRemoved(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            lo, hi = first, last + 1
+        else:
+            lo, hi = bisect.bisect_left(self._rows, first), bisect.bisect_right(self._rows, last)
+
+        self._removing = (lo, hi, last - first + 1)
+        if lo < hi:
+            self.beginRemoveRows(QModelIndex(), lo, hi - 1)
+
+    def __onRowsRemoved(self, parent: QModelIndex, first: int, last: int) -> None:
+        lo, hi, count = self._removing
+        self._removing = None
+        if self._rows is None:
+            self._count -= count
+        else:
+            self._rows[lo:] = [r - count for r in self._rows[hi:]]
+
+        if lo < hi:
+            self.endRemoveRows()
+
+    def __onDataChanged(self, top_left: QModelIndex, bottom_right: QModelIndex, roles: typing.List[int] = []) -> None:
+        last_column = self.columnCount() - 1
+        if self._rows is None:
+            self.dataChanged.emit(self.index(top_left.row(), 0), self.index(bottom_right.row(), last_column))
+            return
+
+        # an edited row may start or stop matching the query
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            pos = bisect.bisect_left(self._rows, row)
+            present = pos < len(self._rows) and self._rows[pos] == row
+            matches = self.__matches(row)
+            if matches and present:
+                self.dataChanged.emit(self.index(pos, 0), self.index(pos, last_column))
+            elif matches:
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._rows.insert(pos, row)
+                self.endInsertRows()
+            elif present:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self._rows[pos]
+                self.endRemoveRows()
+
+    def __onReset(self) -> None:
+        source = self.sourceModel()
+        if self._rows is None:
+            self._count = source.rowCount()
+        else:
+            self._rows = [r for r, item in enumerate(source.items()) if self._query in source.searchKey(item)]
+
+        self.endResetModel()
 
 
 class GroupTable(QTableView):
@@ -127,6 +516,11 @@ class GroupTable(QTableView):
         super().__init__(*args, **kwargs)
         self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.verticalHeader().setDefaultSectionSize(24)
+        self.__proxy = _QuickFilterProxyModel(self)
+        self.__filter = ""
+        # no sort column until a header is clicked, so groups still load page by page
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         index = self.indexAt(event.pos())
@@ -134,7 +528,7 @@ class GroupTable(QTableView):
             event.ignore()
             return
 
-        item = self.model().group.items()[index.row()]
+        item = self.__item(index)
         self.itemSelected.emit(item)
         super().mousePressEvent(event)
 
@@ -144,7 +538,7 @@ class GroupTable(QTableView):
             self.createItem.emit()
             return
 
-        item = self.model().group.items()[index.row()]
+        item = self.__item(index)
         self.itemDoubleClicked.emit(item)
         event.accept()
 
@@ -152,33 +546,55 @@ class GroupTable(QTableView):
     def load(self, group: GroupInterface) -> None:
         self.reset()
         if group.type() == Type.PASSWORD:
-            self.setModel(_PasswordsGroupModel(group))
+            model = _PasswordsGroupModel(group, self)
         elif group.type() == Type.CARD:
-            self.setModel(_CardsGroupModel(group))
+            model = _CardsGroupModel(group, self)
         elif group.type() == Type.IDENTITY:
-            self.setModel(_IdenitiesGroupModel(group))
+            model = _IdenitiesGroupModel(group, self)
         else:
             raise Exception(f"Unsupported group type: {group.type().value}")
 
+        self.__proxy.setSourceModel(model)
+        self.setModel(self.__proxy)
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.__proxy.setQuery(self.__filter)
+
+    @pyqtSlot(str)
+    def setFilter(self, text: str) -> None:
+        self.__filter = text
+        if self.__proxy.sourceModel() is not None:
+            self.__proxy.setQuery(text)
+
     @pyqtSlot(ItemInterface)
     def addItem(self, item: ItemInterface) -> None:
-        m = self.model()
-        m.beginInsertRows(QModelIndex(), len(m.group), len(m.group))
-        m.group.add_item(item)
-        m.endInsertRows()
+        self.__proxy.sourceModel().insertItem(item)
 
     @pyqtSlot(ItemInterface)
     def removeItem(self, item: ItemInterface) -> None:
-        m = self.model()
-        pos = m.group.items().index(item)
-        m.beginRemoveRows(QModelIndex(), pos, pos)
-        m.group.remove_item(item)
-        m.endRemoveRows()
+        self.__proxy.sourceModel().removeItem(item)
+
+    @pyqtSlot(ItemInterface)
+    def updateItem(self, item: ItemInterface) -> None:
+        self.__proxy.sourceModel().itemChanged(item)
 
     @pyqtSlot()
     def clear(self) -> None:
-        m = self.model()
-        m.beginRemoveRows(QModelIndex(), 0, len(m.group)-1)
-        m.endRemoveRows()
-        for item in m.group.items():
-            m.group.remove_item(item)
+        self.__proxy.sourceModel().clear()
+
+    @pyqtSlot(ItemInterface)
+    def selectItem(self, item: ItemInterface) -> None:
+        source = self.__proxy.sourceModel()
+        row = source.rowOf(item)
+        while row >= source.rowCount() and source.canFetchMore():
+            source.fetchMore()
+
+        index = self.__proxy.mapFromSource(source.index(row, 0))
+        if not index.isValid():
+            return
+
+        self.selectRow(index.row())
+        self.scrollTo(index)
+        self.itemSelected.emit(item)
+
+    def __item(self, index: QModelIndex) -> ItemInterface:
+        return self.__proxy.sourceModel().item(self.__proxy.mapToSource(index).row())
@@ -1,102 +1,204 @@
- 
+
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 
-from lib.core.database import Status, DatabaseInterface
+from lib.core.database import Status, Event, DatabaseInterface
 from lib.core.data.group import GroupInterface, Type
 
 
-class _DatabaseStandardItem(QStandardItem):
-
-    def __init__(self, database: DatabaseInterface, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._database = database
-        self._loaded = 0
+class _DatabaseNode:
+    ''' database row and the groups shown under it '''
 
-    def data(self, role: Qt.ItemDataRole) -> QVariant:
-        if role == Qt.DisplayRole:
-            self._updateChilds()
-            return self._database.name() + (" *" if self._database.status() == Status.MODIFIED else "")
+    def __init__(self, database: DatabaseInterface):
+        self.database = database
+        self.groups = ()
+        self.opened = False
 
-        if role == Qt.DecorationRole:
-            closed = self._database.status() == Status.CLOSED
-            icon = QIcon(":/icons/lock" if closed else ":/icons/unlock")
-            return icon
 
-        if role == Qt.EditRole:
-            return self._database.name()
+class _DatabasesTreeModel(QAbstractItemModel):
+    ''' rows follow database events, painting only reads names and statuses '''
 
-        return QVariant()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._nodes = []
+        self._status_icons = {
+            True: QIcon(":/icons/lock"),
+            False: QIcon(":/icons/unlock"),
+        }
+        self._type_icons = {
+            Type.PASSWORD: QIcon(":/icons/key"),
+            Type.CARD: QIcon(":/icons/card"),
+            Type.IDENTITY: QIcon(":/icons/id-card"),
+        }
 
-    def setData(self, value: QVariant, role: Qt.ItemDataRole) -> None:
-        if role != Qt.EditRole:
-            return
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
 
-        self._database.name(value)
+        # database indexes carry no pointer, group indexes point to their database node
+        if not parent.isValid():
+            return self.createIndex(row, column, None)
 
-    def flags(self) -> Qt.ItemFlags:
-        if self._database.status() == Status.CLOSED:
-            return super().flags() & ~Qt.ItemIsEditable
+        return self.createIndex(row, column, self._nodes[parent.row()])
 
-        return super().flags() | Qt.ItemIsEditable
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid() or index.internalPointer() is None:
+            return QModelIndex()
 
-    def _updateChilds(self) -> None:
-        if self._database.status() != Status.CLOSED:
-            if self._loaded == len(self._database.groups()):
-                return
+        return self.createIndex(self._nodes.index(index.internalPointer()), 0, None)
 
-            for group in self._database.groups()[self._loaded:]:
-                self.appendRow(_GroupStandardItem(group))
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._nodes)
+        elif parent.internalPointer() is None and parent.column() == 0:
+            return len(self._nodes[parent.row()].groups)
 
-            self._loaded = len(self._database.groups())
+        return 0
 
-        if self._database.status() == Status.CLOSED and self.hasChildren():
-            self.removeRows(0, self.rowCount())
-            self._loaded = 0
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
 
+    def data(self, index: QModelIndex, role: Qt.ItemDataRole) -> QVariant:
+        if not index.isValid():
+            return QVariant()
 
-class _GroupStandardItem(QStandardItem):
+        group = self.group(index)
+        if group is not None:
+            if role == Qt.DisplayRole or role == Qt.EditRole:
+                return group.name()
+            elif role == Qt.DecorationRole:
+                return self._type_icons.get(group.type(), QVariant())
 
-    def __init__(self, group: GroupInterface, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._group = group
+            return QVariant()
 
-    def data(self, role: Qt.ItemDataRole) -> QVariant:
+        database = self.database(index)
         if role == Qt.DisplayRole:
-            return self._group.name()
-        
-        if role == Qt.DecorationRole:
-            t = self._group.type()
-            if t == Type.PASSWORD:
-                return QIcon(":/icons/key")
-            elif t == Type.CARD:
-                return QIcon(":/icons/card")
-            elif t == Type.IDENTITY:
-                return QIcon(":/icons/id-card")
-
-        if role == Qt.EditRole:
-            return self._group.name()
+            return database.name() + (" *" if database.status() == Status.MODIFIED else "")
+        elif role == Qt.DecorationRole:
+            return self._status_icons[database.status() == Status.CLOSED]
+        elif role == Qt.EditRole:
+            return database.name()
 
         return QVariant()
 
-    def setData(self, value: QVariant, role: Qt.ItemDataRole) -> None:
-        if role != Qt.EditRole or not value:
-            return
-
-        self._group.name(value)
-
-    def flags(self) -> Qt.ItemFlags:
-        return super().flags() | Qt.ItemIsEditable
+    def setData(self, index: QModelIndex, value: QVariant, role: Qt.ItemDataRole = Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole or not value:
+            return False
 
+        group = self.group(index)
+        try:
+            if group is not None:
+                group.name(value)
+            else:
+                self.database(index).name(value)
+        except ValueError:
+            return False
 
-class _DatabasesTreeModel(QStandardItemModel):
+        return True
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
         if not index.isValid():
             return Qt.NoItemFlags
 
-        return self.itemFromIndex(index).flags()
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.group(index) is not None or self.database(index).status() != Status.CLOSED:
+            flags |= Qt.ItemIsEditable
+
+        return flags
+
+    def database(self, index: QModelIndex) -> DatabaseInterface | None:
+        if not index.isValid():
+            return None
+        elif index.internalPointer() is None:
+            return self._nodes[index.row()].database
+
+        return index.internalPointer().database
+
+    def group(self, index: QModelIndex) -> GroupInterface | None:
+        if not index.isValid() or index.internalPointer() is None:
+            return None
+
+        return index.internalPointer().groups[index.row()]
+
+    def databaseIndex(self, database: DatabaseInterface) -> QModelIndex:
+        row = self.__row(database)
+        return QModelIndex() if row is None else self.index(row, 0)
+
+    def addDatabase(self, database: DatabaseInterface) -> None:
+        if self.__row(database) is not None:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self._nodes), len(self._nodes))
+        self._nodes.append(_DatabaseNode(database))
+        self.endInsertRows()
+        database.listen(self.__onEvent)
+        self.__syncGroups(self._nodes[-1], self.index(len(self._nodes) - 1, 0))
+
+    def removeDatabase(self, database: DatabaseInterface) -> None:
+        row = self.__row(database)
+        if row is None:
+            return
+
+        database.unlisten(self.__onEvent)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._nodes[row]
+        self.endRemoveRows()
+
+    def databaseChanged(self, database: DatabaseInterface) -> None:
+        index = self.databaseIndex(database)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def __onEvent(self, database: DatabaseInterface, event: Event, group: GroupInterface | None) -> None:
+        row = self.__row(database)
+        node, parent = self._nodes[row], self.index(row, 0)
+        if event == Event.STATUS_CHANGED:
+            self.__syncGroups(node, parent)
+            self.dataChanged.emit(parent, parent)
+        elif event == Event.RENAMED:
+            self.dataChanged.emit(parent, parent)
+        elif event == Event.GROUP_ADDED:
+            groups = database.groups()
+            if len(groups) > len(node.groups):
+                self.beginInsertRows(parent, len(node.groups), len(groups) - 1)
+                node.groups = groups
+                self.endInsertRows()
+        elif event == Event.GROUP_REMOVED:
+            pos = next((pos for pos, g in enumerate(node.groups) if g is group), None)
+            if pos is None:
+                return
+
+            self.beginRemoveRows(parent, pos, pos)
+            node.groups = database.groups()
+            self.endRemoveRows()
+        elif event == Event.GROUP_RENAMED:
+            index = self.index(database.index_of(group), 0, parent)
+            self.dataChanged.emit(index, index)
+
+    def __syncGroups(self, node: _DatabaseNode, parent: QModelIndex) -> None:
+        # only locking and unlocking replace the groups, group events keep them in sync while opened
+        opened = node.database.status() != Status.CLOSED
+        if opened == node.opened:
+            return
+
+        node.opened = opened
+        groups = node.database.groups() if opened else ()
+        if node.groups:
+            self.beginRemoveRows(parent, 0, len(node.groups) - 1)
+            node.groups = ()
+            self.endRemoveRows()
+        if groups:
+            self.beginInsertRows(parent, 0, len(groups) - 1)
+            node.groups = groups
+            self.endInsertRows()
+
+    def __row(self, database: DatabaseInterface) -> int | None:
+        for row, node in enumerate(self._nodes):
+            if node.database is database:
+                return row
+
+        return None
 
 
 class DatabasesTree(QTreeView):
@@ -111,31 +213,34 @@ class DatabasesTree(QTreeView):
         self.expandsOnDoubleClick()
         self.header().setStretchLastSection(True)
         self.setModel(_DatabasesTreeModel())
-        self._databases = {}
 
     @pyqtSlot(DatabaseInterface)
     def addDatabase(self, database: DatabaseInterface) -> None:
-        if database in self._databases:
-            return
-
-        item = _DatabaseStandardItem(database)
-        self.model().appendRow(item)
-        self._databases[database] = item
+        self.model().addDatabase(database)
 
     @pyqtSlot(DatabaseInterface)
     def removeDatabase(self, database: DatabaseInterface) -> None:
-        item = self._databases[database]
-        self.model().removeRow(item.row())
-        del self._databases[database]
-        self.__emitSignals(None if not self._databases else self.model().item(0))
+        self.model().removeDatabase(database)
+        self.__emitSignals(self.model().index(0, 0))
+
+    @pyqtSlot(DatabaseInterface)
+    def updateDatabase(self, database: DatabaseInterface) -> None:
+        self.model().databaseChanged(database)
+
+    @pyqtSlot(GroupInterface)
+    def selectGroup(self, group: GroupInterface) -> None:
+        db_index = self.model().databaseIndex(group.database())
+        index = self.model().index(group.database().index_of(group), 0, db_index)
+        self.expand(db_index)
+        self.setCurrentIndex(index)
+        self.__emitSignals(index)
 
     @pyqtSlot(GroupInterface)
     def removeGroup(self, group: GroupInterface) -> None:
-        db_item = self._databases[group.database()]
-        grp_ind = group.database().groups().index(group)
-        self.model().removeRow(grp_ind, db_item.index())
+        db_index = self.model().databaseIndex(group.database())
+        grp_ind = group.database().index_of(group)
         group.remove()
-        self.__emitSignals(db_item if grp_ind == 0 else db_item.child(grp_ind))
+        self.__emitSignals(db_index if grp_ind == 0 else self.model().index(grp_ind, 0, db_index))
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         index = self.indexAt(event.pos())
@@ -143,7 +248,7 @@ class DatabasesTree(QTreeView):
             event.ignore()
             return
 
-        self.__emitSignals(self.model().itemFromIndex(index))
+        self.__emitSignals(index)
         super().mousePressEvent(event)
 
     def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
@@ -152,20 +257,21 @@ class DatabasesTree(QTreeView):
             event.ignore()
             return
 
-        item = self.model().itemFromIndex(index)
-        if type(item) is not _DatabaseStandardItem or item._database.status() != Status.CLOSED:
+        database = self.model().database(index)
+        if self.model().group(index) is not None or database.status() != Status.CLOSED:
             return super().mouseDoubleClickEvent(event)
 
-        self.databaseOpening.emit(item._database)
+        self.databaseOpening.emit(database)
         event.accept()
 
-    def __emitSignals(self, item: DatabaseInterface | GroupInterface) -> None:
-        if type(item) is _DatabaseStandardItem and item._database.status() != Status.CLOSED:
-            self.databaseSelected.emit(item._database)
+    def __emitSignals(self, index: QModelIndex) -> None:
+        database, group = self.model().database(index), self.model().group(index)
+        if group is not None:
+            self.databaseSelected.emit(database)
+            self.groupSelected.emit(group)
+        elif database is not None and database.status() != Status.CLOSED:
+            self.databaseSelected.emit(database)
             self.groupSelected.emit(None)
-        elif type(item) is _GroupStandardItem:
-            self.databaseSelected.emit(item._group.database())
-            self.groupSelected.emit(item._group)
         else:
             self.databaseSelected.emit(None)
             self.groupSelected.emit(None)
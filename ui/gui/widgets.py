@@ -1,8 +1,18 @@
 
+import heapq
+import typing
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 
+from lib.core.database import Status, DatabaseInterface
+from lib.core.search import RESULT_LIMIT
+
+
+# milliseconds without typing before the query is searched
+SEARCH_DELAY = 200
+MIN_QUERY_LENGTH = 2
+
 
 class ExpirationDateWidget(QFrame):
 
@@ -63,3 +73,65 @@ class ExpirationDateWidget(QFrame):
         month, year = date.split('/')
         self.__combo_month.setCurrentIndex(self.__combo_month.findText(month))
         self.__combo_year.setCurrentIndex(self.__combo_year.findText(year))
+
+
+class SearchPanel(QWidget):
+    ''' best matches of the query across all unlocked databases '''
+
+    matchActivated = pyqtSignal(object, object)
+
+    def __init__(self, *args, databases: typing.Callable[[], typing.Iterable[DatabaseInterface]] = tuple, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__databases = databases
+        self.__initializeUI()
+        self.__initializeConnections()
+
+    def __initializeUI(self) -> None:
+        self.__edt_query = QLineEdit(placeholderText="Search", clearButtonEnabled=True)
+        self.__lst_matches = QListWidget()
+        self.__tmr_search = QTimer(self, interval=SEARCH_DELAY, singleShot=True)
+
+        lyt_main = QVBoxLayout()
+        lyt_main.setContentsMargins(0, 0, 0, 0)
+        lyt_main.addWidget(self.__edt_query)
+        lyt_main.addWidget(self.__lst_matches)
+        self.setLayout(lyt_main)
+
+    def __initializeConnections(self) -> None:
+        self.__edt_query.textChanged.connect(lambda: self.__tmr_search.start())
+        self.__edt_query.returnPressed.connect(self.__activateFirst)
+        self.__tmr_search.timeout.connect(self.refresh)
+        self.__lst_matches.itemActivated.connect(self.__activate)
+
+    def setFocus(self) -> None:
+        self.__edt_query.setFocus()
+        self.__edt_query.selectAll()
+
+    @pyqtSlot()
+    def refresh(self) -> None:
+        self.search(self.__edt_query.text())
+
+    @pyqtSlot(str)
+    def search(self, query: str) -> None:
+        self.__tmr_search.stop()
+        matches = []
+        for database in self.__databases() if len(query.strip()) >= MIN_QUERY_LENGTH else ():
+            if database.status() != Status.CLOSED:
+                matches.extend((match, database) for match in database.search(query))
+
+        self.__lst_matches.clear()
+        for match, database in heapq.nlargest(RESULT_LIMIT, matches, key=lambda pair: pair[0].score):
+            item = QListWidgetItem(f"{match.title} — {match.detail}" if match.title else match.detail)
+            item.setToolTip(f"{database.name()} / {match.group.name()}")
+            item.setData(Qt.UserRole, (database, match))
+            self.__lst_matches.addItem(item)
+
+    def __activateFirst(self) -> None:
+        # a query typed faster than the delay is searched before its first match is opened
+        if self.__tmr_search.isActive():
+            self.refresh()
+        self.__activate(self.__lst_matches.item(0))
+
+    def __activate(self, item: QListWidgetItem | None) -> None:
+        if item is not None:
+            self.matchActivated.emit(*item.data(Qt.UserRole))
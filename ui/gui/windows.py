@@ -1,5 +1,6 @@
 
 import string
+import sqlite3
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
@@ -9,8 +10,12 @@ import lib.crypto.hasher as hasher
 import lib.crypto.cipher as cipher
 import lib.crypto.generate as generate
 import lib.core.data.factory as factory
+import lib.core.profile as profile
+import lib.core.connection as connection
+import lib.core.search as search
+import lib.core.migrations as migrations
 import lib.ptools as ptools
-from lib.core.config import Config
+from lib.core.config import Config, Change
 from lib.core.database import Status, DatabaseInterface
 from lib.core.sqlite_database import SQLiteDatabase
 from lib.core.data.group import Type, GroupInterface
@@ -21,9 +26,11 @@ from . import line_edits, dialogs, trees, tables, widgets
 DEFAULT_CIPHER = cipher.AES_CBC
 DEFAULT_HASHER = hasher.SHA256
 DEFAULT_ENCODER = encoder.Base64
+RELEASE_IDLE_INTERVAL = 30 * 1000
 
 
 class MainWindow(QMainWindow):
+    configChanged = pyqtSignal(object)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -38,6 +45,10 @@ class MainWindow(QMainWindow):
         self.__setCurrentDatabase(None)
         self.__setCurrentGroup(None)
         self.__setCurrentItem(None)
+        self.__tmr_release_idle = QTimer(self, interval=RELEASE_IDLE_INTERVAL, timeout=connection.POOL.release_idle)
+        self.__tmr_release_idle.start()
+        # metadata refresh runs in a background thread, the signal queues the repaint to the gui thread
+        Config().listen(self.__onConfigChanged)
     
     def __initActions(self) -> None:
         self.__actions = {
@@ -76,6 +87,7 @@ class MainWindow(QMainWindow):
             "card-copy-holder": QAction("Copy Holder", self),
 
             # tools
+            "search": QAction("Search", self, shortcut=QKeySequence("Ctrl+F")),
             "generate-password": QAction(QIcon(":/icons/generate"), "Generate Password", self, shortcut="Ctrl+G")
         }
 
@@ -118,30 +130,43 @@ class MainWindow(QMainWindow):
         self.__menu_card.addAction(self.__actions["card-copy-holder"])
 
         menu_tools = self.menuBar().addMenu("Tools")
+        menu_tools.addAction(self.__actions["search"])
         menu_tools.addAction(self.__actions["generate-password"])
 
     def __initUI(self) -> None:
         self.setWindowIcon(QIcon(":/icons/ico"))
         self.__tbl_group = tables.GroupTable()
+        self.__edt_filter = QLineEdit(placeholderText="Filter", clearButtonEnabled=True)
         self.__tree_databases = trees.DatabasesTree()
         for db in Config().databases():
             self.__tree_databases.addDatabase(db)
 
+        lyt_group = QVBoxLayout()
+        lyt_group.setContentsMargins(0, 0, 0, 0)
+        lyt_group.addWidget(self.__edt_filter)
+        lyt_group.addWidget(self.__tbl_group)
+        wgt_group = QWidget()
+        wgt_group.setLayout(lyt_group)
+
         wgt_main = QSplitter()
         wgt_main.addWidget(self.__tree_databases)
-        wgt_main.addWidget(self.__tbl_group)
+        wgt_main.addWidget(wgt_group)
         wgt_main.setSizes([200, 550])
         self.setCentralWidget(wgt_main)
 
+        self.__pnl_search = widgets.SearchPanel(databases=Config().databases)
+        self.__dock_search = QDockWidget("Search", self)
+        self.__dock_search.setWidget(self.__pnl_search)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.__dock_search)
+        self.__dock_search.hide()
+
     def __initConnections(self) -> None:
         self.__actions["exit"].triggered.connect(QApplication.exit)
         self.__actions["new-database"].triggered.connect(self.__newDatabase)
         self.__actions["open-database"].triggered.connect(self.__openDatabase)
         self.__actions["close-database"].triggered.connect(self.__closeDatabase)
         self.__actions["remove-database"].triggered.connect(self.__removeDatabase)
-        self.__actions["remove-database"].triggered.connect(self.__tree_databases.viewport().update)
-        self.__actions["save-database"].triggered.connect(lambda: self.__database.save())
-        self.__actions["save-database"].triggered.connect(self.__tree_databases.viewport().update)
+        self.__actions["save-database"].triggered.connect(self.__saveDatabase)
         self.__actions["database-settings"].triggered.connect(lambda: DatabaseSettingsWindow(self.__database).exec_())
         self.__actions["change-master-key"].triggered.connect(self.__changeMasterKey)
         self.__actions["add-group-passwords"].triggered.connect(lambda: self.__addGroup(Type.PASSWORD))
@@ -160,6 +185,7 @@ class MainWindow(QMainWindow):
         self.__actions["card-copy-cvv"].triggered.connect(lambda: self.__clipboard.setText(self.__item.entry("cvv")))
         self.__actions["card-copy-number"].triggered.connect(lambda: self.__clipboard.setText(self.__item.entry("number")))
         self.__actions["generate-password"].triggered.connect(lambda: GeneratePasswordWindow(self).exec_())
+        self.__actions["search"].triggered.connect(self.__showSearch)
 
         self.__tree_databases.databaseOpening.connect(self.__unlockDatabase)
         self.__tree_databases.databaseSelected.connect(self.__setCurrentDatabase)
@@ -168,6 +194,13 @@ class MainWindow(QMainWindow):
         self.__tbl_group.itemSelected.connect(self.__setCurrentItem)
         self.__tbl_group.itemDoubleClicked.connect(self.__editItem)
         self.__tbl_group.createItem.connect(lambda: self.__editItem(None))
+        self.__edt_filter.textChanged.connect(self.__tbl_group.setFilter)
+        self.__pnl_search.matchActivated.connect(self.__showMatch)
+        self.configChanged.connect(self.__tree_databases.updateDatabase)
+
+    def __onConfigChanged(self, change: Change, database: DatabaseInterface | None) -> None:
+        if change == Change.UPDATED:
+            self.configChanged.emit(database)
 
     @pyqtSlot()
     def __newDatabase(self) -> None:
@@ -204,8 +237,29 @@ class MainWindow(QMainWindow):
     def __closeDatabase(self) -> None:
         self.__database.close()
         self.__setCurrentDatabase(None)
-        self.__tree_databases.viewport().update()
         self.__tbl_group.setModel(None)
+        self.__pnl_search.refresh()
+
+    @pyqtSlot()
+    def __showSearch(self) -> None:
+        self.__dock_search.show()
+        self.__pnl_search.setFocus()
+
+    def __showMatch(self, database: DatabaseInterface, match: search.Match) -> None:
+        if database.status() == Status.CLOSED:
+            self.__pnl_search.refresh()
+            return
+
+        try:
+            item = search.item_of(match)
+            self.__tree_databases.selectGroup(match.group)
+        except ValueError:
+            # the item or its group was removed after the search
+            self.__pnl_search.refresh()
+            return
+
+        self.__edt_filter.clear()
+        self.__tbl_group.selectItem(item)
 
     @pyqtSlot()
     def __changeMasterKey(self) -> None:
@@ -252,7 +306,6 @@ class MainWindow(QMainWindow):
             return
 
         self.__tbl_group.clear()
-        self.__tree_databases.viewport().update()
         self.__setCurrentItem(None)
 
     @pyqtSlot(ItemInterface)
@@ -268,6 +321,8 @@ class MainWindow(QMainWindow):
 
         if item is None:
             win.itemCreated.connect(self.__tbl_group.addItem)
+        else:
+            win.itemChanged.connect(self.__tbl_group.updateItem)
 
         win.exec_()
 
@@ -278,7 +333,6 @@ class MainWindow(QMainWindow):
             return
 
         self.__tbl_group.removeItem(self.__item)
-        self.__tree_databases.viewport().update()
 
     @pyqtSlot(DatabaseInterface)
     def __setCurrentDatabase(self, database: DatabaseInterface) -> None:
@@ -323,6 +377,13 @@ class MainWindow(QMainWindow):
         self.__menu_password.setEnabled(not_none and item.group().type() is Type.PASSWORD)
         self.__menu_card.setEnabled(not_none and item.group().type() is Type.CARD)
 
+    @pyqtSlot()
+    def __saveDatabase(self) -> None:
+        try:
+            self.__database.save()
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Save Database", f"Database was not saved, changes are kept\n{e}")
+
     @pyqtSlot(DatabaseInterface)
     def __unlockDatabase(self, database: DatabaseInterface) -> None:
         master_key = QInputDialog.getText(self, "Database Opening...", "Master Key: ", QLineEdit.Password)[0]
@@ -334,6 +395,8 @@ class MainWindow(QMainWindow):
             self.__setCurrentDatabase(database)
         except ValueError:
             QMessageBox.critical(self, "Database Opening...", "Specified master key is incorrect")
+        except (migrations.MigrationError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Database Opening...", f"Database can not be upgraded\n{e}")
 
     @pyqtSlot(Type)
     def __addGroup(self, group_type: Type) -> None:
@@ -497,10 +560,15 @@ class DatabaseSettingsWindow(QDialog):
     def __generalTab(self) -> QWidget:
         self.__edt_name = QLineEdit(self._database.name())
         self.__edt_location = QLineEdit(self._database.location(), readOnly=True)
+        self.__cbx_profile = QComboBox()
+        self.__cbx_profile.addItems([i.value for i in profile.Profile])
+        self.__cbx_profile.setCurrentText(Config().profile(self._database).value)
+        self.__cbx_profile.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Preferred)
         lyt = QFormLayout()
         lyt.addRow(QLabel("Database Name"), self.__edt_name)
         lyt.addRow(QLabel("Database Location"), self.__edt_location)
         lyt.addRow(QLabel("Groups Count"), QLabel(str(len(self._database.groups()))))
+        lyt.addRow(QLabel("Performance"), self.__cbx_profile)
         wgt = QWidget()
         wgt.setLayout(lyt)
         return wgt
@@ -548,6 +616,7 @@ class DatabaseSettingsWindow(QDialog):
         self._database.hasher(hasher.from_id(self.__cbx_hasher.currentText()))
         self._database.cipher(cipher.from_id(self.__cbx_cipher.currentText()))
         self._database.encoder(encoder.from_id(self.__cbx_encoder.currentText()))
+        Config().profile(self._database, profile.Profile(self.__cbx_profile.currentText()))
         self.databaseChanged.emit(self._database)
         self.accept()
 
@@ -555,6 +624,7 @@ class DatabaseSettingsWindow(QDialog):
 class EditPasswordWindow(QDialog):
 
     itemCreated = pyqtSignal(ItemInterface)
+    itemChanged = pyqtSignal(ItemInterface)
 
     def __init__(self, *args, item: ItemInterface = None, **kwargs): 
         super().__init__(*args, **kwargs)
@@ -611,6 +681,8 @@ class EditPasswordWindow(QDialog):
             for k, v in data.items():
                 self.__item.entry(k, v)
 
+            self.itemChanged.emit(self.__item)
+
         self.accept()
 
     def __errorMessage(self) -> QMessageBox:
@@ -628,6 +700,7 @@ class EditPasswordWindow(QDialog):
 class EditCardWindow(QDialog):
 
     itemCreated = pyqtSignal(CardItem)
+    itemChanged = pyqtSignal(CardItem)
 
     def __init__(self, *args, item: CardItem = None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -682,6 +755,8 @@ class EditCardWindow(QDialog):
             for k, v in data.items():
                 self.__item.entry(k, v)
 
+            self.itemChanged.emit(self.__item)
+
         self.accept()
 
     def __errorMessage(self) -> QMessageBox:
@@ -697,6 +772,7 @@ class EditCardWindow(QDialog):
 class EditIdentityWindow(QDialog):
 
     itemCreated = pyqtSignal(IdentityItem)
+    itemChanged = pyqtSignal(IdentityItem)
 
     def __init__(self, *args, item: IdentityItem = None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -748,6 +824,8 @@ class EditIdentityWindow(QDialog):
             for k, v in data.items():
                 self.__item.entry(k, v)
 
+            self.itemChanged.emit(self.__item)
+
         self.accept()
 
     def __errorMessage(self) -> QMessageBox: